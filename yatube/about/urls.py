@@ -1,5 +1,7 @@
 from django.urls import path
 
+from core.asgi import read_only
+
 from . import views
 
 
@@ -7,6 +9,6 @@ app_name = 'about'
 
 
 urlpatterns = [
-    path('author/', views.AboutAuthorView.as_view(), name='author'),
-    path('tech/', views.AboutTechView.as_view(), name='tech'),
+    path('author/', read_only(views.AboutAuthorView.as_view()), name='author'),
+    path('tech/', read_only(views.AboutTechView.as_view()), name='tech'),
 ]
@@ -0,0 +1,29 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Task
+
+
+class TaskAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'name',
+        'run_at',
+        'attempts',
+        'failed_at',
+    )
+    list_filter = ('name',)
+    readonly_fields = ('created', 'last_error')
+    actions = ('retry',)
+    empty_value_display = '-пусто-'
+
+    def retry(self, request, queryset):
+        """Повторить задачи сейчас, в том числе неудавшиеся."""
+        updated = queryset.update(
+            run_at=timezone.now(), attempts=0, failed_at=None,
+            locked_by='')
+        self.message_user(request, f'Поставлено в очередь: {updated}')
+    retry.short_description = 'Выполнить снова'
+
+
+admin.site.register(Task, TaskAdmin)
@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from django.utils.module_loading import autodiscover_modules
+
+        from . import auth, mail, sqlite  # noqa: F401
+        # Задачи приложений регистрируются при импорте их модулей tasks.
+        autodiscover_modules('tasks')
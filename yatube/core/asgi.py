@@ -0,0 +1,163 @@
+"""ASGI-вход для yatube поверх WSGI-обработчика Django.
+
+Django 2.2 не умеет асинхронные view, поэтому обработчик принимает
+соединения в цикле событий, а сам запрос выполняет в ограниченном пуле
+потоков. Запросы GET/HEAD к view, помеченным read_only(), идут в пул
+ASGI_READ_THREADS, остальные - в отдельный пул ASGI_WRITE_THREADS, чтобы
+медленное чтение SQLite не занимало потоки записи и наоборот.
+"""
+import asyncio
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+READ_METHODS = ('GET', 'HEAD')
+
+
+def read_only(view):
+    """Помечает view только для чтения: в ASGI он выполняется в пуле
+    чтения."""
+    view.read_only = True
+    return view
+
+
+def is_read_only(path):
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return False
+    return getattr(match.func, 'read_only', False)
+
+
+def build_environ(scope, body):
+    """WSGI environ из области HTTP-запроса ASGI."""
+    script_name = scope.get('root_path', '')
+    path = scope['path']
+    if script_name and path.startswith(script_name):
+        path = path[len(script_name):]
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': script_name.encode().decode('latin1'),
+        'PATH_INFO': path.encode().decode('latin1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'REMOTE_ADDR': client[0],
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin1').upper().replace('-', '_')
+        value = value.decode('latin1')
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f'HTTP_{name}'
+        if name in environ:
+            value = f'{environ[name]},{value}'
+        environ[name] = value
+    return environ
+
+
+class ASGIHandler:
+    def __init__(self, wsgi_application, read_threads=None,
+                 write_threads=None):
+        self.wsgi_application = wsgi_application
+        self.read_pool = ThreadPoolExecutor(
+            read_threads or settings.ASGI_READ_THREADS,
+            thread_name_prefix='asgi-read')
+        self.write_pool = ThreadPoolExecutor(
+            write_threads or settings.ASGI_WRITE_THREADS,
+            thread_name_prefix='asgi-write')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] != 'http':
+            raise ValueError(f"Неподдерживаемый тип ASGI: {scope['type']}")
+        body = await self.read_body(receive)
+        if body is None:
+            return
+        if scope['method'] in READ_METHODS and is_read_only(scope['path']):
+            pool = self.read_pool
+        else:
+            pool = self.write_pool
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            pool, self.run, build_environ(scope, body), send, loop)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.read_pool.shutdown(wait=True)
+                self.write_pool.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def read_body(self, receive):
+        """Тело запроса целиком или None, если клиент отключился."""
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body', False):
+                return b''.join(chunks)
+
+    def run(self, environ, send, loop):
+        """Выполняет WSGI-приложение в потоке пула и пересылает ответ
+        частями по мере их готовности."""
+        def call(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        start = {}
+
+        def start_response(status, headers, exc_info=None):
+            start['message'] = {
+                'type': 'http.response.start',
+                'status': int(status.split(' ', 1)[0]),
+                'headers': [
+                    (name.lower().encode('latin1'), value.encode('latin1'))
+                    for name, value in headers
+                ],
+            }
+
+        iterable = self.wsgi_application(environ, start_response)
+        try:
+            started = False
+            for chunk in iterable:
+                if not chunk:
+                    continue
+                if not started:
+                    call(start['message'])
+                    started = True
+                call({
+                    'type': 'http.response.body',
+                    'body': chunk,
+                    'more_body': True,
+                })
+            if not started:
+                call(start['message'])
+            call({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(iterable, 'close'):
+                iterable.close()
+
+
+def get_asgi_application():
+    from django.core.wsgi import get_wsgi_application
+
+    return ASGIHandler(get_wsgi_application())
@@ -0,0 +1,99 @@
+"""Кэш пользователя сессии: request.user без запроса к auth_user.
+
+Пользователь хранится в кэше USER_CACHE вместе с хешем пароля, с которым
+он был загружен (get_session_auth_hash). Запись годится, только если хеш
+в сессии совпадает с ней; иначе пользователь загружается и проверяется
+штатным django.contrib.auth.get_user. Сохранение пользователя (смена
+пароля через PasswordChangeView, вход с обновлением last_login) и выход
+удаляют запись. Изменения через queryset.update() сигналов не дают:
+после них нужен invalidate_cached_user().
+
+Кэш включается настройкой USER_CACHE и годится, только если бэкенд общий
+для всех процессов сервера: иначе выход и смена пароля сбросят запись
+лишь в одном из них. Проверка core.W001 предупреждает о кэше в памяти
+процесса - для USER_CACHE и для сессий в кэше.
+"""
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.auth.signals import user_logged_out
+from django.core import checks
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+def user_cache():
+    return caches[settings.USER_CACHE]
+
+
+def user_key(user_id):
+    return f'auth_user:{user_id}'
+
+
+PER_PROCESS_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+CACHED_SESSION_ENGINES = {
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+}
+
+
+@checks.register(checks.Tags.caches, checks.Tags.security)
+def check_shared_caches(app_configs, **kwargs):
+    aliases = {}
+    if settings.USER_CACHE:
+        aliases['USER_CACHE'] = settings.USER_CACHE
+    if settings.SESSION_ENGINE in CACHED_SESSION_ENGINES:
+        aliases['SESSION_CACHE_ALIAS'] = settings.SESSION_CACHE_ALIAS
+    return [
+        checks.Warning(
+            f'{name} = {alias!r}: кэш в памяти процесса. Выход и смена '
+            f'пароля не дойдут до других процессов сервера.',
+            hint='Укажите общий бэкенд (Memcached, Redis, DatabaseCache) '
+                 'или отключите кэш.',
+            id='core.W001',
+        )
+        for name, alias in aliases.items()
+        if settings.CACHES[alias]['BACKEND'] in PER_PROCESS_CACHES
+    ]
+
+
+def get_cached_user(request):
+    if not settings.USER_CACHE:
+        return auth.get_user(request)
+    session = request.session
+    user_id = session.get(auth.SESSION_KEY)
+    session_hash = session.get(auth.HASH_SESSION_KEY)
+    if user_id is None or session_hash is None:
+        return auth.get_user(request)
+    cached = user_cache().get(user_key(user_id))
+    if cached is not None and cached[0] == session_hash:
+        return cached[1]
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        user_cache().set(
+            user_key(user_id),
+            (user.get_session_auth_hash(), user),
+            settings.USER_CACHE_TIMEOUT,
+        )
+    return user
+
+
+def invalidate_cached_user(user_id):
+    if settings.USER_CACHE:
+        user_cache().delete(user_key(user_id))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def drop_saved_user(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def drop_logged_out_user(sender, request, user, **kwargs):
+    if user is not None and not isinstance(user, AnonymousUser):
+        invalidate_cached_user(user.pk)
@@ -0,0 +1,667 @@
+"""Нагрузочные замеры yatube.
+
+Набор замеров регистрируется декоратором register() и возвращает словарь
+{имя сценария: метрики}. Команда manage.py bench запускает наборы,
+печатает результаты и сравнивает их с сохранённым базовым JSON.
+
+Наборы, которые пишут в базу (register(..., writes=True)), работают с
+временной копией основной базы: замер не оставляет постов, задач и
+пользователей в рабочей базе разработчика.
+"""
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+
+SUITES = {}
+
+
+def register(name, writes=False):
+    def decorator(suite):
+        if writes:
+            @wraps(suite)
+            def run(options):
+                with scratch_database():
+                    return suite(options)
+            SUITES[name] = run
+        else:
+            SUITES[name] = suite
+        return suite
+    return decorator
+
+
+@contextmanager
+def scratch_database():
+    """Подменяет соединение default соединением с временной копией базы.
+
+    Копия снимается через соединение Django, поэтому видит и базу в
+    памяти. Внутри открытой транзакции копия не видела бы её изменений.
+    """
+    original = connections['default']
+    if original.vendor != 'sqlite':
+        raise ValueError('Замеры с записью работают только с SQLite.')
+    if original.in_atomic_block:
+        raise RuntimeError('Копия базы снимается вне транзакции.')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.sqlite3')
+        original.ensure_connection()
+        target = sqlite3.connect(path)
+        try:
+            original.connection.backup(target)
+        finally:
+            target.close()
+        copy = type(original)(
+            {**original.settings_dict, 'NAME': path}, 'default')
+        connections['default'] = copy
+        try:
+            yield path
+        finally:
+            copy.close()
+            connections['default'] = original
+
+
+def percentile(values, q):
+    """Перцентиль q (0-100) с линейной интерполяцией."""
+    values = sorted(values)
+    if not values:
+        return 0.0
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (
+        position - lower)
+
+
+def summarize(timings, queries=None):
+    """Сводка по списку длительностей в секундах."""
+    total = sum(timings)
+    result = {
+        'requests': len(timings),
+        'p50_ms': percentile(timings, 50) * 1000,
+        'p95_ms': percentile(timings, 95) * 1000,
+        'p99_ms': percentile(timings, 99) * 1000,
+        'rps': len(timings) / total if total else 0.0,
+    }
+    if queries is not None:
+        result['queries'] = max(queries) if queries else 0
+    return result
+
+
+def measure(func, requests, warmup=0):
+    """Вызывает func requests раз, считая время и SQL-запросы вызова."""
+    for _ in range(warmup):
+        func()
+    timings, queries = [], []
+    for _ in range(requests):
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        queries.append(len(context.captured_queries))
+    return summarize(timings, queries)
+
+
+def compare(results, baseline, tolerance):
+    """Список регрессий относительно baseline.
+
+    Регрессия - рост p95 или размера (метрики *_bytes) больше чем на
+    tolerance (доля) либо рост числа запросов к БД.
+    """
+    regressions = []
+    for suite, scenarios in results.items():
+        for name, metrics in scenarios.items():
+            base = baseline.get(suite, {}).get(name, {})
+            for key, value in metrics.items():
+                if key not in base:
+                    continue
+                if key == 'queries':
+                    limit = base[key]
+                elif key == 'p95_ms' or key.endswith('_bytes'):
+                    limit = base[key] * (1 + tolerance)
+                else:
+                    continue
+                if value > limit:
+                    regressions.append(
+                        f'{suite}.{name}: {key} {value:.2f} > {limit:.2f}')
+    return regressions
+
+
+@register('views', writes=True)
+def views_suite(options):
+    """Основные страницы yatube через тестовый клиент Django."""
+    from django.test import Client
+    from django.urls import reverse
+
+    from posts.models import Group, Post
+
+    post = Post.objects.select_related('author', 'group').filter(
+        group__isnull=False).first()
+    if post is None:
+        raise ValueError('В базе нет постов: сначала manage.py seed.')
+    client = Client()
+    author_client = Client()
+    author_client.force_login(post.author)
+    deep_page = max(Post.objects.count() // 10 // 2, 1)
+    scenarios = {
+        'index': (client.get, reverse('posts:index')),
+        'index_deep_page': (
+            client.get, reverse('posts:index') + f'?page={deep_page}'),
+        'group_posts': (client.get, reverse(
+            'posts:group_list', args=(post.group.slug,))),
+        'profile': (client.get, reverse(
+            'posts:profile', args=(post.author.username,))),
+        'post_detail': (client.get, reverse(
+            'posts:post_detail', args=(post.pk,))),
+    }
+    results = {}
+    for name, (method, url) in scenarios.items():
+        results[name] = measure(
+            lambda: method(url), options['requests'], options['warmup'])
+    group_id = Group.objects.values_list('pk', flat=True).first()
+    url = reverse('posts:post_create')
+    results['post_create'] = measure(
+        lambda: author_client.post(
+            url, {'text': 'Замер производительности', 'group': group_id}),
+        options['requests'],
+    )
+    return results
+
+
+@register('metrics_overhead')
+def metrics_overhead_suite(options):
+    """Главная страница без выборки метрик, с выборкой по умолчанию и
+    с замером каждого запроса."""
+    from django.conf import settings
+    from django.test import Client, override_settings
+    from django.urls import reverse
+
+    client = Client()
+    url = reverse('posts:index')
+    rates = (
+        ('sampling_off', 0),
+        ('sampling_default', settings.METRICS_SAMPLE_RATE),
+        ('sampling_all', 1),
+    )
+    results = {}
+    for name, rate in rates:
+        with override_settings(METRICS_SAMPLE_RATE=rate):
+            results[name] = measure(
+                lambda: client.get(url),
+                options['requests'], options['warmup'])
+    return results
+
+
+@register('date_filter')
+def date_filter_suite(options):
+    """Отрисовка десяти дат ленты фильтром date и cached_date."""
+    from datetime import timedelta
+
+    from django.template import Context, Template
+    from django.utils import timezone, translation
+
+    now = timezone.now()
+    context = Context({
+        'dates': [now - timedelta(days=day) for day in range(10)],
+    })
+    templates = {
+        'builtin_date': Template(
+            '{% for d in dates %}{{ d|date:"d E Y" }}{% endfor %}'),
+        'cached_date': Template(
+            '{% load cached_dates %}'
+            '{% for d in dates %}{{ d|cached_date:"d E Y" }}{% endfor %}'),
+    }
+    results = {}
+    with translation.override('ru'):
+        for name, template in templates.items():
+            results[name] = measure(
+                lambda: template.render(context),
+                options['requests'], options['warmup'])
+    return results
+
+
+LEGACY_PAGE_LINKS = (
+    '{% for i in page_obj.paginator.page_range %}'
+    '{% if page_obj.number == i %}'
+    '<li class="page-item active"><span class="page-link">{{ i }}</span></li>'
+    '{% else %}'
+    '<li class="page-item"><a class="page-link" href="?page={{ i }}">'
+    '{{ i }}</a></li>'
+    '{% endif %}{% endfor %}'
+)
+
+
+@register('paginator')
+def paginator_suite(options):
+    """Навигация по страницам ленты: перечисление всех страниц против
+    окна вокруг текущей, на 10 тысячах и миллионе постов."""
+    from django.core.paginator import Paginator
+    from django.template import Context, Template
+    from django.template.loader import get_template
+
+    templates = {
+        'legacy': Template(LEGACY_PAGE_LINKS),
+        'windowed': get_template('posts/includes/paginator.html').template,
+    }
+    results = {}
+    for posts in (10_000, 1_000_000):
+        page_obj = Paginator(range(posts), 10).get_page(posts // 20)
+        context = Context({'page_obj': page_obj})
+        for name, template in templates.items():
+            scenario = f'{name}_{posts}'
+            results[scenario] = measure(
+                lambda: template.render(context),
+                options['requests'], options['warmup'])
+            results[scenario]['html_bytes'] = len(
+                template.render(context).encode())
+    return results
+
+
+@register('api')
+def api_suite(options):
+    """JSON API против HTML-страниц тех же лент, плюс разреженные поля и
+    большая потоковая страница."""
+    from django.test import Client
+    from django.urls import reverse
+
+    from posts.models import Post
+
+    post = Post.objects.select_related('author', 'group').filter(
+        group__isnull=False).first()
+    if post is None:
+        raise ValueError('В базе нет постов: сначала manage.py seed.')
+    client = Client()
+    slug, username = post.group.slug, post.author.username
+    scenarios = {
+        'html_index': reverse('posts:index'),
+        'api_index': reverse('posts:api_posts') + '?limit=10',
+        'html_group': reverse('posts:group_list', args=(slug,)),
+        'api_group': reverse(
+            'posts:api_group_posts', args=(slug,)) + '?limit=10',
+        'html_profile': reverse('posts:profile', args=(username,)),
+        'api_profile': reverse(
+            'posts:api_author_posts', args=(username,)) + '?limit=10',
+        'api_sparse': reverse('posts:api_posts') + '?limit=10&fields=id',
+        'api_large_page': reverse('posts:api_posts') + '?limit=1000',
+    }
+
+    def fetch(url):
+        response = client.get(url)
+        if response.streaming:
+            return b''.join(response.streaming_content)
+        return response.content
+
+    results = {}
+    for name, url in scenarios.items():
+        results[name] = measure(
+            lambda: fetch(url), options['requests'], options['warmup'])
+        results[name]['response_bytes'] = len(fetch(url))
+    return results
+
+
+@register('servers')
+def servers_suite(options):
+    """Пропускная способность запущенных серверов при параллельных
+    соединениях: --server wsgi=http://127.0.0.1:8000 --server asgi=...
+
+    Серверы запускаются отдельно, например gunicorn yatube.wsgi и uvicorn
+    yatube.asgi:application, на одной базе.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from urllib.request import urlopen
+
+    from django.urls import reverse
+
+    from posts.models import Post
+
+    servers = dict(
+        server.split('=', 1) for server in options.get('server') or ())
+    if not servers:
+        raise ValueError('Укажите серверы: --server имя=http://адрес:порт')
+    post = Post.objects.select_related('author', 'group').filter(
+        group__isnull=False).first()
+    if post is None:
+        raise ValueError('В базе нет постов: сначала manage.py seed.')
+    paths = {
+        'index': reverse('posts:index'),
+        'group_posts': reverse('posts:group_list', args=(post.group.slug,)),
+        'profile': reverse('posts:profile', args=(post.author.username,)),
+        'post_detail': reverse('posts:post_detail', args=(post.pk,)),
+        'about_tech': reverse('about:tech'),
+    }
+    concurrency = options.get('concurrency') or 16
+
+    def fetch(url):
+        start = time.perf_counter()
+        with urlopen(url) as response:
+            response.read()
+        return time.perf_counter() - start
+
+    results = {}
+    with ThreadPoolExecutor(concurrency) as pool:
+        for server, base_url in servers.items():
+            for name, path in paths.items():
+                url = base_url.rstrip('/') + path
+                list(pool.map(fetch, [url] * options['warmup']))
+                start = time.perf_counter()
+                timings = list(pool.map(fetch, [url] * options['requests']))
+                elapsed = time.perf_counter() - start
+                scenario = results[f'{server}_{name}'] = summarize(timings)
+                scenario['rps'] = len(timings) / elapsed
+                scenario['concurrency'] = concurrency
+    return results
+
+
+FEED_SQL = (
+    'SELECT id, text, pub_date, author_id, group_id FROM posts_post '
+    'ORDER BY pub_date DESC, id DESC LIMIT 10'
+)
+INSERT_SQL = (
+    'INSERT INTO posts_post (text, pub_date, author_id, group_id, '
+    "author_username, author_full_name) VALUES (?, ?, ?, NULL, 'bench', '')"
+)
+
+
+class ContentionRun:
+    """Читатели выбирают ленту, пока писатель вставляет requests постов."""
+
+    def __init__(self, path, pragmas, requests):
+        import threading
+
+        self.path = path
+        self.pragmas = pragmas
+        self.requests = requests
+        self.timings = {'read': [], 'write': []}
+        self.errors = []
+        self.writing = threading.Event()
+
+    def connect(self):
+        import sqlite3
+
+        from .sqlite import apply_pragmas
+
+        db = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None)
+        apply_pragmas(db.cursor(), self.pragmas)
+        return db
+
+    def timed(self, kind, db, *statements):
+        import sqlite3
+
+        start = time.perf_counter()
+        try:
+            for statement in statements:
+                db.execute(*statement).fetchall()
+        except sqlite3.OperationalError as error:
+            self.errors.append(str(error))
+            if db.in_transaction:
+                db.execute('ROLLBACK')
+            return
+        self.timings[kind].append(time.perf_counter() - start)
+
+    def read(self):
+        db = self.connect()
+        done = 0
+        while self.writing.is_set() or done < self.requests:
+            self.timed('read', db, (FEED_SQL,))
+            done += 1
+        db.close()
+
+    def write(self, author_id):
+        from django.utils import timezone
+
+        db = self.connect()
+        try:
+            for number in range(self.requests):
+                self.timed('write', db, ('BEGIN',), (INSERT_SQL, (
+                    f'Замер {number}', timezone.now().isoformat(' '),
+                    author_id,
+                )), ('COMMIT',))
+        finally:
+            db.close()
+            self.writing.clear()
+
+    def __call__(self, readers, author_id):
+        """Возвращает общее время прогона в секундах."""
+        import threading
+
+        self.writing.set()
+        threads = [
+            threading.Thread(target=self.read) for _ in range(readers)]
+        threads.append(threading.Thread(target=self.write, args=(author_id,)))
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start
+
+
+@register('sqlite_contention')
+def sqlite_contention_suite(options):
+    """Чтение ленты в --concurrency потоков при параллельной записи постов:
+    журнал SQLite по умолчанию против SQLITE_PRAGMAS, на копиях базы."""
+    import os
+    import sqlite3
+    import tempfile
+
+    from django.conf import settings
+
+    from posts.models import Post
+
+    author_id = Post.objects.values_list('author_id', flat=True).first()
+    if author_id is None:
+        raise ValueError('В базе нет постов: сначала manage.py seed.')
+    # Копия базы в WAL сама остаётся в WAL: режим журнала задаётся явно.
+    setups = {
+        'default_journal': ('delete', {}),
+        'tuned_pragmas': ('wal', settings.SQLITE_PRAGMAS),
+    }
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (journal_mode, pragmas) in setups.items():
+            path = os.path.join(directory, f'{name}.sqlite3')
+            source = sqlite3.connect(settings.DATABASES['default']['NAME'])
+            target = sqlite3.connect(path)
+            try:
+                source.backup(target)
+                mode, = target.execute(
+                    f'PRAGMA journal_mode = {journal_mode}').fetchone()
+            finally:
+                target.close()
+                source.close()
+            if mode != journal_mode:
+                raise RuntimeError(
+                    f'{name}: journal_mode {mode} вместо {journal_mode}')
+            run = ContentionRun(path, pragmas, options['requests'])
+            elapsed = run(options.get('concurrency') or 4, author_id)
+            for kind, values in run.timings.items():
+                scenario = results[f'{name}_{kind}'] = summarize(values)
+                scenario['rps'] = len(values) / elapsed
+            results[f'{name}_write']['errors'] = len(run.errors)
+    return results
+
+
+@register('feed_memory')
+def feed_memory_suite(options):
+    """Память и время выборки страницы ленты: посты с JOIN auth_user и
+    полными User против постов с копией подписи автора (.only)."""
+    import tracemalloc
+
+    from posts.authors import CARD_FIELDS
+    from posts.models import Post
+
+    pages = {
+        'select_related_author': (
+            Post.objects.select_related('author'),
+            lambda post: post.author.get_full_name()),
+        'author_fields_only': (
+            Post.objects.only(*CARD_FIELDS),
+            lambda post: post.author_full_name),
+    }
+    results = {}
+    for size in (10, 1000):
+        for name, (queryset, signature) in pages.items():
+            page = queryset.order_by('-pub_date', '-pk')[:size]
+            scenario = f'{name}_{size}'
+            results[scenario] = measure(
+                lambda: [signature(post) for post in page.all()],
+                options['requests'], options['warmup'])
+            tracemalloc.start()
+            posts = list(page.all())
+            results[scenario]['page_bytes'] = (
+                tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            del posts
+    return results
+
+
+@register('admin', writes=True)
+def admin_suite(options):
+    """Список постов в админке: прежние настройки PostAdmin (select всех
+    групп в каждой строке, COUNT(*), фильтр pub_date) против текущих."""
+    from django.contrib import admin
+    from django.contrib.auth import get_user_model
+    from django.test import RequestFactory
+
+    from posts.models import Post
+
+    class LegacyPostAdmin(admin.ModelAdmin):
+        list_display = ('pk', 'text', 'pub_date', 'author', 'group')
+        list_editable = ('group',)
+        search_fields = ('text',)
+        list_filter = ('pub_date',)
+        empty_value_display = '-пусто-'
+
+    user = get_user_model().objects.filter(is_superuser=True).first()
+    if user is None:
+        user = get_user_model().objects.create_superuser(
+            'bench_admin', 'bench@example.com', None)
+    admins = {
+        'legacy': LegacyPostAdmin(Post, admin.site),
+        'current': admin.site._registry[Post],
+    }
+    year = Post.objects.order_by('-pub_date').values_list(
+        'pub_date__year', flat=True).first()
+    queries = {
+        'changelist': {},
+        'changelist_year': {'pub_date__year': year},
+        'changelist_search': {'q': 'пост'},
+    }
+    factory = RequestFactory()
+
+    def render(model_admin, params):
+        request = factory.get('/admin/posts/post/', params)
+        request.user = user
+        response = model_admin.changelist_view(request)
+        return response.render().content
+
+    results = {}
+    for name, params in queries.items():
+        for variant, model_admin in admins.items():
+            scenario = f'{variant}_{name}'
+            results[scenario] = measure(
+                lambda: render(model_admin, params),
+                options['requests'], options['warmup'])
+            results[scenario]['html_bytes'] = len(render(model_admin, params))
+    return results
+
+
+@register('tasks', writes=True)
+def tasks_suite(options):
+    """Сброс пароля: письмо отправляется в запросе (TASKS_EAGER) или
+    кладётся в очередь; отдельно - выполнение очереди воркером."""
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.test.utils import override_settings
+    from django.urls import reverse
+
+    from core.models import Task
+    from core.tasks import run_batch
+
+    user, _ = get_user_model().objects.get_or_create(
+        username='bench_mail', defaults={'email': 'bench@example.com'})
+    user.set_password('bench-password')
+    user.save()
+    client = Client()
+    url = reverse('users:password_reset')
+    results = {}
+    for name, eager in (('password_reset_eager', True),
+                        ('password_reset_queued', False)):
+        with override_settings(TASKS_EAGER=eager):
+            results[name] = measure(
+                lambda: client.post(url, {'email': user.email}),
+                options['requests'], options['warmup'])
+    queued = Task.objects.count()
+    results['worker_batch'] = measure(
+        run_batch, max(queued // 20, 1))
+    results['worker_batch']['tasks'] = queued
+    return results
+
+
+STARTUP_SCRIPT = '''
+import json, os, sys, time
+start = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+import django
+from django.conf import settings
+django.setup()
+settings.DEBUG = False
+settings.WARMUP_ON_START = sys.argv[2] == 'warm'
+from django.test import Client
+import yatube.wsgi
+ready = time.perf_counter()
+client = Client()
+timings = []
+for _ in range(2):
+    request_start = time.perf_counter()
+    response = client.get(sys.argv[1])
+    assert response.status_code == 200, response.status_code
+    timings.append(time.perf_counter() - request_start)
+print(json.dumps({
+    'startup': ready - start, 'first': timings[0], 'second': timings[1]}))
+'''
+
+
+@register('startup')
+def startup_suite(options):
+    """Холодный старт процесса: время до готовности и первый запрос к
+    страницам без прогрева (cold) и с warm_up() при старте (warm).
+
+    Каждый замер - отдельный процесс python с DEBUG = False.
+    """
+    import json
+    import subprocess
+    import sys
+
+    from django.conf import settings
+    from django.urls import reverse
+
+    from posts.models import Post
+
+    post = Post.objects.first()
+    if post is None:
+        raise ValueError('В базе нет постов: сначала manage.py seed.')
+    paths = {
+        'index': reverse('posts:index'),
+        'post_detail': reverse('posts:post_detail', args=(post.pk,)),
+    }
+    runs = max(min(options['requests'], 10), 1)
+    results = {}
+    for name, path in paths.items():
+        for mode in ('cold', 'warm'):
+            samples = []
+            for _ in range(runs):
+                output = subprocess.run(
+                    [sys.executable, '-c', STARTUP_SCRIPT, path, mode],
+                    cwd=settings.BASE_DIR, check=True,
+                    stdout=subprocess.PIPE).stdout
+                samples.append(json.loads(output.decode().splitlines()[-1]))
+            for key in ('startup', 'first', 'second'):
+                results[f'{mode}_{name}_{key}'] = summarize(
+                    [sample[key] for sample in samples])
+    return results
@@ -0,0 +1,55 @@
+"""Отправка почты через очередь задач.
+
+QueuedEmailBackend кладёт письма в очередь одной задачей на вызов
+send_messages(), а воркер отправляет их через TASKS_EMAIL_BACKEND одним
+соединением. Запрос не ждёт SMTP или запись файла, если TASKS_EAGER
+выключен; при TASKS_EAGER письма отправляются сразу.
+"""
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .tasks import task
+
+MESSAGE_FIELDS = (
+    'subject', 'body', 'from_email', 'to', 'cc', 'bcc', 'reply_to',
+    'extra_headers',
+)
+
+
+def serialize_message(message):
+    if message.attachments:
+        raise ValueError('QueuedEmailBackend не передаёт вложения.')
+    data = {field: getattr(message, field) for field in MESSAGE_FIELDS}
+    data['alternatives'] = getattr(message, 'alternatives', [])
+    return data
+
+
+def build_message(data, connection):
+    return EmailMultiAlternatives(
+        subject=data['subject'],
+        body=data['body'],
+        from_email=data['from_email'],
+        to=data['to'],
+        cc=data['cc'],
+        bcc=data['bcc'],
+        reply_to=data['reply_to'],
+        headers=data['extra_headers'],
+        alternatives=[tuple(item) for item in data['alternatives']],
+        connection=connection,
+    )
+
+
+@task(name='core.send_emails')
+def send_emails(messages):
+    connection = get_connection(settings.TASKS_EMAIL_BACKEND)
+    connection.send_messages(
+        [build_message(data, connection) for data in messages])
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        messages = [serialize_message(message) for message in email_messages]
+        if messages:
+            send_emails.defer(messages)
+        return len(messages)
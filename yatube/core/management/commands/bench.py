@@ -0,0 +1,69 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.bench import SUITES, compare
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет задержку (p50/p95/p99), пропускную способность и число '
+        'запросов к БД. Сравнивает результат с базовым JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--suite', action='append', choices=sorted(SUITES),
+            help='Набор замеров, можно несколько. По умолчанию - views.')
+        parser.add_argument('--requests', type=int, default=100)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--baseline', help='Путь к базовому JSON.')
+        parser.add_argument(
+            '--save-baseline', action='store_true',
+            help='Записать результаты в --baseline вместо сравнения.')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help='Допустимый рост p95, доля (0.2 = 20%%).')
+        parser.add_argument('--output', help='Куда записать результаты JSON.')
+        parser.add_argument(
+            '--server', action='append',
+            help='Сервер для набора servers: имя=URL, можно несколько.')
+        parser.add_argument(
+            '--concurrency', type=int, default=16,
+            help='Параллельных соединений в наборе servers.')
+
+    def handle(self, *args, **options):
+        results = {}
+        for name in options['suite'] or ['views']:
+            results[name] = SUITES[name](options)
+            self.print_suite(name, results[name])
+        if options['output']:
+            self.dump(results, options['output'])
+        baseline_path = options['baseline']
+        if not baseline_path:
+            return
+        if options['save_baseline']:
+            self.dump(results, baseline_path)
+            self.stdout.write(f'Базовые значения записаны в {baseline_path}')
+            return
+        with open(baseline_path, encoding='utf-8') as file:
+            regressions = compare(
+                results, json.load(file), options['tolerance'])
+        if regressions:
+            raise CommandError(
+                'Регрессии производительности:\n' + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS('Регрессий нет.'))
+
+    def print_suite(self, name, scenarios):
+        self.stdout.write(self.style.MIGRATE_HEADING(name))
+        for scenario, metrics in scenarios.items():
+            line = ', '.join(
+                f'{key}={value:.2f}' if isinstance(value, float)
+                else f'{key}={value}'
+                for key, value in metrics.items()
+            )
+            self.stdout.write(f'  {scenario}: {line}')
+
+    def dump(self, results, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
@@ -0,0 +1,31 @@
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        'Печатает гистограммы запросов работающего сервера. Метрики живут '
+        'в памяти процесса, поэтому читаются через эндпоинт /metrics/ '
+        'с токеном METRICS_TOKEN.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url', default='http://127.0.0.1:8000/metrics/')
+        parser.add_argument(
+            '--view', help='Показать только строки этого view.')
+
+    def handle(self, *args, **options):
+        request = Request(options['url'])
+        if settings.METRICS_TOKEN:
+            request.add_header(
+                'Authorization', f'Bearer {settings.METRICS_TOKEN}')
+        with urlopen(request, timeout=10) as response:
+            text = response.read().decode()
+        for line in text.splitlines():
+            if options['view'] and not line.startswith('#'):
+                if f'view="{options["view"]}"' not in line:
+                    continue
+            self.stdout.write(line)
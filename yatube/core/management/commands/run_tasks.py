@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.tasks import run_workers
+
+
+class Command(BaseCommand):
+    help = (
+        'Воркер очереди фоновых задач (core.Task). Несколько воркеров '
+        'можно запускать одновременно: каждая задача достаётся одному.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=1,
+            help='Сколько задач выполнять параллельно (потоков).')
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.TASKS_BATCH_SIZE,
+            help='Сколько задач забирать из очереди за раз.')
+        parser.add_argument(
+            '--burst', action='store_true',
+            help='Завершиться, когда очередь опустеет.')
+
+    def handle(self, *args, **options):
+        try:
+            run_workers(
+                options['concurrency'],
+                burst=options['burst'],
+                batch_size=options['batch_size'],
+            )
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS('Воркер остановлен.'))
@@ -0,0 +1,82 @@
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from faker import Faker
+
+from posts.models import Group, Post, User
+from posts.stats import rebuild_author_stats
+
+TEXT_POOL_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу воспроизводимыми тестовыми данными для замеров: '
+        'manage.py seed --posts 1000000'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument(
+            '--users', type=int,
+            help='По умолчанию - один автор на 100 постов.')
+        parser.add_argument(
+            '--groups', type=int,
+            help='По умолчанию - одна группа на 1000 постов.')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--locale', default='ru_RU')
+
+    def handle(self, *args, **options):
+        posts = options['posts']
+        users = options['users'] or max(posts // 100, 1)
+        groups = options['groups'] or max(posts // 1000, 1)
+        batch_size = options['batch_size']
+        fake = Faker(options['locale'])
+        fake.seed_instance(options['seed'])
+        rnd = random.Random(options['seed'])
+        password = make_password('bench-password')
+
+        start = User.objects.count()
+        self.create(User, (
+            User(
+                username=f'bench{start + index}',
+                first_name=fake.first_name(),
+                last_name=fake.last_name(),
+                password=password,
+            ) for index in range(users)
+        ), batch_size)
+        start = Group.objects.count()
+        self.create(Group, (
+            Group(
+                title=fake.sentence(nb_words=3)[:200],
+                slug=f'bench-{start + index}',
+                description=fake.paragraph(),
+            ) for index in range(groups)
+        ), batch_size)
+
+        user_ids = list(User.objects.values_list('pk', flat=True))
+        group_ids = list(Group.objects.values_list('pk', flat=True))
+        texts = [fake.paragraph(nb_sentences=5) for _ in range(TEXT_POOL_SIZE)]
+        self.create(Post, (
+            Post(
+                text=rnd.choice(texts),
+                author_id=rnd.choice(user_ids),
+                group_id=rnd.choice(group_ids) if rnd.random() < 0.8 else None,
+            ) for _ in range(posts)
+        ), batch_size)
+        rebuild_author_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: {users} пользователей, {groups} групп, '
+            f'{posts} постов.'))
+
+    def create(self, model, objects, batch_size):
+        """bulk_create из генератора пачками, не держа всё в памяти."""
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) == batch_size:
+                model.objects.bulk_create(batch)
+                batch = []
+        model.objects.bulk_create(batch)
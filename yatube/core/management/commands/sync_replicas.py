@@ -0,0 +1,37 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def copy_database(source, target):
+    """Согласованная копия базы SQLite через backup API: работает и при
+    открытых на запись соединениях, и в режиме WAL."""
+    source_db = sqlite3.connect(source)
+    target_db = sqlite3.connect(target)
+    try:
+        source_db.backup(target_db)
+    finally:
+        target_db.close()
+        source_db.close()
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную базу SQLite в реплики DATABASE_REPLICAS. '
+        'Локальная замена репликации: запускать после записи или по cron.'
+    )
+
+    def handle(self, *args, **options):
+        primary = settings.DATABASES['default']
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError(
+                'Реплик нет: задайте YATUBE_SQLITE_REPLICAS или '
+                'DATABASE_REPLICAS.')
+        for alias in settings.DATABASE_REPLICAS:
+            replica = settings.DATABASES[alias]
+            if not all('sqlite3' in db['ENGINE'] for db in (primary, replica)):
+                raise CommandError('sync_replicas копирует только SQLite.')
+            copy_database(primary['NAME'], replica['NAME'])
+            self.stdout.write(f'{alias}: {replica["NAME"]}')
+        self.stdout.write(self.style.SUCCESS('Реплики обновлены.'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогревает процесс: импортирует view, собирает таблицы URL и '
+        'разбирает шаблоны проекта. Проверяет шаблоны перед деплоем и '
+        'показывает время прогрева. Процессы сервера прогреваются сами '
+        'при WARMUP_ON_START (yatube/wsgi.py).'
+    )
+
+    def handle(self, *args, **options):
+        stats = warm_up()
+        self.stdout.write(self.style.SUCCESS(
+            f'Маршрутов: {stats["urls"]}, шаблонов: {stats["templates"]}, '
+            f'{stats["seconds"] * 1000:.1f} мс.'))
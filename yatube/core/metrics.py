@@ -0,0 +1,76 @@
+"""Гистограммы времени запросов в памяти процесса.
+
+Значения группируются по имени view и метрике, наружу отдаются в
+текстовом формате Prometheus.
+"""
+import bisect
+import threading
+from collections import defaultdict
+
+BUCKETS = {
+    'db_queries': (1, 2, 3, 5, 10, 20, 50, 100),
+    'db_seconds': (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+    'template_seconds': (
+        0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+    'response_seconds': (
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+    'response_bytes': (1024, 4096, 16384, 65536, 262144, 1048576),
+}
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = defaultdict(dict)
+
+    def observe(self, view, values):
+        with self.lock:
+            histograms = self.histograms[view]
+            for metric, value in values.items():
+                if metric not in histograms:
+                    histograms[metric] = Histogram(BUCKETS[metric])
+                histograms[metric].observe(value)
+
+    def clear(self):
+        with self.lock:
+            self.histograms.clear()
+
+    def render(self):
+        """Текст в формате Prometheus exposition 0.0.4."""
+        lines = []
+        with self.lock:
+            for metric in BUCKETS:
+                name = f'yatube_view_{metric}'
+                lines.append(f'# TYPE {name} histogram')
+                for view, histograms in sorted(self.histograms.items()):
+                    histogram = histograms.get(metric)
+                    if histogram is None:
+                        continue
+                    label = f'view="{view}"'
+                    cumulative = 0
+                    bounds = [*histogram.buckets, '+Inf']
+                    for bound, count in zip(bounds, histogram.counts):
+                        cumulative += count
+                        lines.append(
+                            f'{name}_bucket{{{label},le="{bound}"}} '
+                            f'{cumulative}')
+                    lines.append(f'{name}_sum{{{label}}} {histogram.sum}')
+                    lines.append(
+                        f'{name}_count{{{label}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
@@ -0,0 +1,204 @@
+import random
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.db import connections
+from django.http import FileResponse, HttpResponseNotModified
+from django.template.backends.django import Template
+from django.utils.functional import SimpleLazyObject
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .auth import get_cached_user
+from .metrics import registry
+from .routers import allow_replica_reads, request_reads
+from .staticfiles import build_index, cache_control, choose_encoding
+
+_local = threading.local()
+
+
+def _patch_template_render():
+    """Засекает время верхнеуровневой отрисовки шаблонов в выборке."""
+    if getattr(Template.render, 'measured', False):
+        return
+    original = Template.render
+
+    @wraps(original)
+    def render(self, *args, **kwargs):
+        state = getattr(_local, 'state', None)
+        if state is None or state['rendering']:
+            return original(self, *args, **kwargs)
+        state['rendering'] = True
+        start = time.perf_counter()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            state['template_seconds'] += time.perf_counter() - start
+            state['rendering'] = False
+
+    render.measured = True
+    Template.render = render
+
+
+class RequestMetricsMiddleware:
+    """Собирает по имени view число SQL-запросов, время в БД, время
+    отрисовки шаблонов, полное время ответа и его размер.
+
+    Замеряется доля METRICS_SAMPLE_RATE запросов, остальные проходят без
+    накладных расходов.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        _patch_template_render()
+
+    def __call__(self, request):
+        if random.random() >= settings.METRICS_SAMPLE_RATE:
+            return self.get_response(request)
+        state = {
+            'db_queries': 0,
+            'db_seconds': 0.0,
+            'template_seconds': 0.0,
+            'rendering': False,
+        }
+        start = time.perf_counter()
+        with self.measure(state):
+            response = self.get_response(request)
+        if response.streaming:
+            response.streaming_content = self.measure_stream(
+                request, response.streaming_content, state, start)
+        else:
+            self.observe(request, state, start, len(response.content))
+        return response
+
+    @contextmanager
+    def measure(self, state):
+        _local.state = state
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(
+                        lambda *args: self.count_query(state, *args)))
+                yield
+        finally:
+            _local.state = None
+
+    def measure_stream(self, request, content, state, start):
+        """Потоковый ответ (JSON API) читает базу, пока его отдают: замер
+        продолжается до последнего фрагмента."""
+        size = 0
+        with self.measure(state):
+            for chunk in content:
+                size += len(chunk)
+                yield chunk
+        self.observe(request, state, start, size)
+
+    @staticmethod
+    def observe(request, state, start, size):
+        match = request.resolver_match
+        registry.observe(match.view_name if match else 'unresolved', {
+            'db_queries': state['db_queries'],
+            'db_seconds': state['db_seconds'],
+            'template_seconds': state['template_seconds'],
+            'response_seconds': time.perf_counter() - start,
+            'response_bytes': size,
+        })
+
+    @staticmethod
+    def count_query(state, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            state['db_queries'] += 1
+            state['db_seconds'] += time.perf_counter() - start
+
+
+class ReplicaRoutingMiddleware:
+    """Направляет чтение view, помеченных read_only(), на реплики.
+
+    View уже найден обработчиком Django к process_view, поэтому URL не
+    разбирается заново: process_view лишь включает реплики, а __call__
+    выключает их по завершении запроса. Стоит последней в MIDDLEWARE:
+    view, обработка исключений и отрисовка шаблона идут уже с реплик.
+
+    После запроса с изменением данных (POST и т. п.) клиент получает cookie
+    REPLICA_PIN_COOKIE на REPLICA_PIN_SECONDS секунд: пока она есть, его
+    чтение идёт с основной базы и он видит собственные записи, даже если
+    реплики ещё не догнали её.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_reads():
+            response = self.get_response(request)
+        if (settings.DATABASE_REPLICAS
+                and request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+                and response.status_code < 500):
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS, httponly=True,
+                samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (settings.DATABASE_REPLICAS
+                and request.method in ('GET', 'HEAD')
+                and settings.REPLICA_PIN_COOKIE not in request.COOKIES
+                and getattr(view_func, 'read_only', False)):
+            allow_replica_reads()
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware с пользователем из кэша, см. core/auth.py."""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
+
+
+class StaticFilesMiddleware:
+    """Отдаёт собранную collectstatic статику из STATIC_ROOT.
+
+    Стоит первой в MIDDLEWARE. Выбирает .br или .gz копию по
+    Accept-Encoding, файлам с хешем в имени ставит Cache-Control immutable.
+    Список файлов читается при старте процесса: после collectstatic
+    процесс нужно перезапустить. Запросы к файлам, которых нет в
+    STATIC_ROOT, проходят дальше (в DEBUG их отдаёт runserver).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        self.files = build_index(settings.STATIC_ROOT)
+
+    def __call__(self, request):
+        if (not self.files or request.method not in ('GET', 'HEAD')
+                or not request.path_info.startswith(self.prefix)):
+            return self.get_response(request)
+        static_file = self.files.get(request.path_info[len(self.prefix):])
+        if static_file is None:
+            return self.get_response(request)
+        if not was_modified_since(
+                request.META.get('HTTP_IF_MODIFIED_SINCE'),
+                static_file.mtime):
+            response = HttpResponseNotModified()
+        else:
+            path, encoding = choose_encoding(
+                static_file, request.META.get('HTTP_ACCEPT_ENCODING', ''))
+            response = FileResponse(open(path, 'rb'))
+            # FileResponse определил бы тип по .gz в имени копии.
+            response['Content-Type'] = static_file.content_type
+            if encoding:
+                response['Content-Encoding'] = encoding
+            response['Last-Modified'] = http_date(static_file.mtime)
+        response['Cache-Control'] = cache_control(static_file)
+        if static_file.encodings:
+            response['Vary'] = 'Accept-Encoding'
+        return response
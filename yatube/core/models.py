@@ -0,0 +1,32 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """Отложенный вызов функции из core.tasks.
+
+    Взятая воркером задача переносится по run_at на срок аренды: если
+    воркер упал, задача снова станет доступна после её окончания.
+    """
+    name = models.CharField('Задача', max_length=200)
+    payload = models.TextField('Аргументы (JSON)')
+    run_at = models.DateTimeField('Запуск не раньше', default=timezone.now)
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    locked_by = models.CharField(
+        'Воркер', max_length=32, blank=True, db_index=True)
+    failed_at = models.DateTimeField('Ошибка', null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created = models.DateTimeField('Создана', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        indexes = [
+            models.Index(
+                fields=['run_at', 'id'], name='core_task_due_idx',
+                condition=Q(failed_at__isnull=True)),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.name} #{self.pk}'
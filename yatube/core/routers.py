@@ -0,0 +1,73 @@
+"""Чтение лент с реплик базы.
+
+Запросы на чтение уходят на реплику (случайную из DATABASE_REPLICAS)
+только внутри replica_reads() или после allow_replica_reads() в блоке
+request_reads(): так ReplicaRoutingMiddleware включает реплики для view,
+помеченных read_only(). Запись, админка, регистрация и все
+остальные view работают с default.
+
+Реплика может отставать, поэтому то, что надолго кладётся в общий кэш
+(ленты, дата свежего поста, реестр групп), читается внутри
+primary_reads() с основной базы.
+"""
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+
+# Сессии читаются с основной базы: только что созданная сессия могла ещё
+# не попасть на реплику.
+PRIMARY_ONLY_APPS = {'sessions'}
+
+_local = threading.local()
+
+
+@contextmanager
+def _reads(replicas):
+    previous = getattr(_local, 'replicas', False)
+    _local.replicas = replicas
+    try:
+        yield
+    finally:
+        _local.replicas = previous
+
+
+def replica_reads():
+    return _reads(True)
+
+
+def primary_reads():
+    return _reads(False)
+
+
+def request_reads():
+    """Блок запроса: allow_replica_reads() внутри него действует до
+    выхода из блока."""
+    return _reads(False)
+
+
+def allow_replica_reads():
+    _local.replicas = True
+
+
+def reading_replicas():
+    return bool(settings.DATABASE_REPLICAS
+                and getattr(_local, 'replicas', False))
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if (not reading_replicas()
+                or model._meta.app_label in PRIMARY_ONLY_APPS):
+            return 'default'
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
@@ -0,0 +1,27 @@
+"""Настройка соединений SQLite: WAL, synchronous, кэш страниц, mmap.
+
+PRAGMA из settings.SQLITE_PRAGMAS выполняются при каждом новом
+соединении (сигнал connection_created). В режиме WAL чтение лент не
+ждёт записи постов, а synchronous=NORMAL в WAL не теряет целостность
+базы при сбое процесса.
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def apply_pragmas(cursor, pragmas):
+    for name, value in pragmas.items():
+        if not name.isidentifier() or not isinstance(value, (int, str)):
+            raise ValueError(f'Неверная PRAGMA {name}={value!r}')
+        if isinstance(value, str) and not value.isalnum():
+            raise ValueError(f'Неверная PRAGMA {name}={value!r}')
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(connection_created)
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, settings.SQLITE_PRAGMAS)
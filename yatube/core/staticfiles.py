@@ -0,0 +1,137 @@
+"""Статика с хешем содержимого в имени и заранее сжатыми копиями.
+
+collectstatic с CompressedManifestStaticFilesStorage кладёт в STATIC_ROOT
+файлы вида bootstrap.min.3f2a1c.css, манифест staticfiles.json и рядом с
+каждым текстовым файлом .gz и, если установлен пакет brotli, .br.
+StaticFilesMiddleware отдаёт из STATIC_ROOT подходящую сжатую копию, а
+файлам с хешем в имени ставит Cache-Control immutable на год: повторный
+визит не запрашивает их вовсе.
+"""
+import gzip
+import json
+import mimetypes
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {
+    '.css', '.js', '.map', '.svg', '.ico', '.txt', '.html', '.json',
+    '.xml', '.eot', '.ttf', '.otf',
+}
+# Сжатая копия хранится, только если она заметно меньше исходного файла.
+MIN_RATIO = 0.95
+
+
+def compressors():
+    result = {'gzip': ('.gz', lambda data: gzip.compress(data, 9, mtime=0))}
+    if brotli is not None:
+        result['br'] = ('.br', brotli.compress)
+    return result
+
+
+def compress_file(path):
+    """Пишет рядом с файлом его сжатые копии. Возвращает их суффиксы."""
+    if os.path.splitext(path)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+        return []
+    with open(path, 'rb') as source:
+        data = source.read()
+    written = []
+    for suffix, compress in compressors().values():
+        compressed = compress(data)
+        if len(compressed) < len(data) * MIN_RATIO:
+            with open(path + suffix, 'wb') as target:
+                target.write(compressed)
+            written.append(suffix)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage, дописывающий .gz и .br копии файлов."""
+
+    def post_process(self, *args, **kwargs):
+        yield from super().post_process(*args, **kwargs)
+        if kwargs.get('dry_run'):
+            return
+        names = set(self.hashed_files) | set(self.hashed_files.values())
+        for name in sorted(names):
+            path = self.path(name)
+            if os.path.isfile(path):
+                compress_file(path)
+
+
+class StaticFile:
+    __slots__ = ('path', 'content_type', 'encodings', 'immutable', 'mtime')
+
+    def __init__(self, path, encodings, immutable):
+        self.path = path
+        self.content_type = (
+            mimetypes.guess_type(path)[0] or 'application/octet-stream')
+        self.encodings = encodings
+        self.immutable = immutable
+        self.mtime = os.stat(path).st_mtime
+
+
+def manifest_names(root):
+    """Имена файлов с хешем из staticfiles.json."""
+    try:
+        with open(os.path.join(root, 'staticfiles.json')) as manifest:
+            return set(json.load(manifest).get('paths', {}).values())
+    except (OSError, ValueError):
+        return set()
+
+
+def build_index(root):
+    """Словарь {имя файла относительно STATIC_ROOT: StaticFile}.
+
+    Собирается один раз при старте процесса, чтобы запрос к статике не
+    обращался к диску ради os.stat.
+    """
+    if not root or not os.path.isdir(root):
+        return {}
+    hashed = manifest_names(root)
+    suffixes = {suffix: encoding
+                for encoding, (suffix, _) in compressors().items()}
+    index = {}
+    for directory, _, files in os.walk(root):
+        present = set(files)
+        for filename in files:
+            base, extension = os.path.splitext(filename)
+            if extension in suffixes and base in present:
+                continue
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+            encodings = {
+                encoding: path + suffix
+                for suffix, encoding in suffixes.items()
+                if filename + suffix in present
+            }
+            index[name] = StaticFile(path, encodings, name in hashed)
+    return index
+
+
+def choose_encoding(static_file, accept_encoding):
+    """Путь к копии файла и её Content-Encoding (None для исходного)."""
+    accepted = set()
+    for item in accept_encoding.split(','):
+        encoding, _, params = item.partition(';')
+        quality = params.replace(' ', '').partition('q=')[2]
+        if quality and not quality.strip('0.'):
+            continue
+        accepted.add(encoding.strip())
+    for encoding in ('br', 'gzip'):
+        if encoding in accepted and encoding in static_file.encodings:
+            return static_file.encodings[encoding], encoding
+    return static_file.path, None
+
+
+def cache_control(static_file):
+    if static_file.immutable:
+        return (f'public, max-age={settings.STATIC_IMMUTABLE_MAX_AGE}, '
+                'immutable')
+    return f'public, max-age={settings.STATIC_MAX_AGE}'
@@ -0,0 +1,160 @@
+"""Очередь фоновых задач в основной базе (модель core.Task).
+
+Задача - функция, зарегистрированная декоратором task(). defer() кладёт
+её вызов в очередь, а воркер manage.py run_tasks выполняет задачи
+пачками по TASKS_BATCH_SIZE, с повторами и паузой между попытками.
+Задача пишется в очередь в текущей транзакции, если она открыта
+(transaction.atomic): при откате задачи не останется. Без транзакции
+запись фиксируется сразу.
+
+При TASKS_EAGER задачи выполняются сразу в вызывающем процессе, и воркер
+не нужен; по умолчанию так только при DEBUG.
+"""
+import json
+import logging
+import threading
+import traceback
+import uuid
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+
+def task(func=None, *, name=None, max_attempts=None):
+    """Регистрирует функцию как задачу и добавляет ей метод defer().
+
+    Аргументы задачи должны сериализоваться в JSON.
+    """
+    if func is None:
+        return partial(task, name=name, max_attempts=max_attempts)
+    func.task_name = name or f'{func.__module__}.{func.__qualname__}'
+    func.max_attempts = max_attempts
+    func.defer = partial(defer, func)
+    TASKS[func.task_name] = func
+    return func
+
+
+def defer(func, *args, **kwargs):
+    """Ставит вызов func(*args, **kwargs) в очередь."""
+    payload = json.dumps({'args': args, 'kwargs': kwargs})
+    if settings.TASKS_EAGER:
+        # Круговой проход через JSON: задача получает те же аргументы,
+        # что и из очереди.
+        payload = json.loads(payload)
+        return func(*payload['args'], **payload['kwargs'])
+    return Task.objects.create(name=func.task_name, payload=payload)
+
+
+def claim(batch_size, lease):
+    """Забирает до batch_size готовых задач одним UPDATE.
+
+    Условие run_at <= now повторяется в UPDATE, поэтому задачу, которую
+    одновременно выбрали два воркера, получит только один.
+    """
+    token = uuid.uuid4().hex
+    now = timezone.now()
+    due = Task.objects.filter(
+        failed_at__isnull=True, run_at__lte=now
+    ).order_by('run_at', 'pk').values('pk')[:batch_size]
+    claimed = Task.objects.filter(
+        pk__in=due, failed_at__isnull=True, run_at__lte=now
+    ).update(
+        locked_by=token,
+        run_at=now + timedelta(seconds=lease),
+        attempts=F('attempts') + 1,
+    )
+    if not claimed:
+        return []
+    return list(Task.objects.filter(locked_by=token).order_by('pk'))
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=settings.TASKS_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def execute(task_row):
+    """Выполняет задачу. Возвращает True при успехе, иначе откладывает
+    следующую попытку или помечает задачу неудавшейся."""
+    func = TASKS.get(task_row.name)
+    try:
+        if func is None:
+            raise LookupError(f'Задача {task_row.name} не зарегистрирована')
+        payload = json.loads(task_row.payload)
+        func(*payload['args'], **payload['kwargs'])
+    except Exception:
+        logger.exception('Задача %s упала', task_row)
+        now = timezone.now()
+        max_attempts = (
+            func.max_attempts or settings.TASKS_MAX_ATTEMPTS) if func else 1
+        changes = {'locked_by': '', 'last_error': traceback.format_exc()}
+        if task_row.attempts >= max_attempts:
+            changes['failed_at'] = now
+        else:
+            changes['run_at'] = now + retry_delay(task_row.attempts)
+        # Если аренда истекла и задачу забрал другой воркер, его попытку
+        # не трогаем.
+        Task.objects.filter(
+            pk=task_row.pk, locked_by=task_row.locked_by).update(**changes)
+        return False
+    return True
+
+
+def run_batch(batch_size=None, lease=None):
+    """Забирает и выполняет пачку задач. Возвращает их число.
+
+    Выполненные задачи удаляются одним DELETE на пачку - только те, что
+    всё ещё закреплены за этой пачкой.
+    """
+    tasks = claim(
+        batch_size or settings.TASKS_BATCH_SIZE,
+        lease or settings.TASKS_LEASE,
+    )
+    done = [task_row.pk for task_row in tasks if execute(task_row)]
+    if done:
+        Task.objects.filter(
+            pk__in=done, locked_by=tasks[0].locked_by).delete()
+    return len(tasks)
+
+
+def work(stop, burst=False, batch_size=None, poll_interval=None):
+    """Цикл воркера до stop.set(). С burst - до опустевшей очереди."""
+    poll_interval = poll_interval or settings.TASKS_POLL_INTERVAL
+    while not stop.is_set():
+        if run_batch(batch_size):
+            continue
+        if burst:
+            break
+        stop.wait(poll_interval)
+
+
+def run_workers(concurrency, stop=None, **options):
+    """Запускает concurrency воркеров в потоках текущего процесса."""
+    stop = stop or threading.Event()
+    if concurrency == 1:
+        return work(stop, **options)
+
+    def target():
+        try:
+            work(stop, **options)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=target, daemon=True)
+               for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            thread.join()
+    finally:
+        stop.set()
@@ -0,0 +1,54 @@
+import datetime
+from functools import lru_cache
+
+from django import template
+from django.template.defaultfilters import date as date_filter
+from django.utils import timezone, translation
+
+register = template.Library()
+
+CACHE_SIZE = 4096
+# Символы формата date, зависящие от времени суток или смещения пояса.
+TIME_FORMAT_CHARS = frozenset('aABcefgGhHiIOPrsTuUZ')
+
+
+@lru_cache(maxsize=256)
+def uses_time(format_string):
+    escaped = False
+    for char in format_string:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char in TIME_FORMAT_CHARS:
+            return True
+    return False
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def format_date(day, arg, language):
+    """Результат фильтра date для местной даты и локали.
+
+    Ключ - календарный день в текущем поясе, а не момент публикации:
+    все посты одного дня делят запись. language входит в ключ, потому что
+    от него зависят названия месяцев.
+    """
+    return date_filter(day, arg)
+
+
+@register.filter(is_safe=False)
+def cached_date(value, arg=None):
+    """Фильтр date с запоминанием результата в ограниченном LRU-кэше.
+
+    Запоминаются только форматы без времени суток; остальные
+    форматируются как обычно.
+    """
+    if not isinstance(value, datetime.date):
+        return date_filter(value, arg)
+    if isinstance(value, datetime.datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        if not arg or uses_time(arg):
+            return date_filter(value, arg)
+        value = value.date()
+    return format_date(value, arg, translation.get_language())
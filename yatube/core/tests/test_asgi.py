@@ -0,0 +1,100 @@
+import asyncio
+
+from django.core.wsgi import get_wsgi_application
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from ..asgi import ASGIHandler, build_environ, is_read_only
+
+
+def run(handler, scope, messages):
+    """Прогоняет обработчик на заданных входящих сообщениях ASGI."""
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(handler(scope, receive, send))
+    return sent
+
+
+def request(handler, path):
+    return run(handler, {
+        'type': 'http',
+        'method': 'GET',
+        'path': path,
+        'query_string': b'',
+        'headers': [],
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 50000),
+    }, [{'type': 'http.request', 'body': b''}])
+
+
+class ASGIHandlerTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.handler = ASGIHandler(
+            get_wsgi_application(), read_threads=2, write_threads=1)
+
+    def test_read_only_views(self):
+        """Ленты и страницы about идут в пул чтения, остальное - нет."""
+        self.assertTrue(is_read_only(reverse('posts:index')))
+        self.assertTrue(is_read_only(reverse('about:tech')))
+        self.assertTrue(
+            is_read_only(reverse('posts:post_detail', args=(1,))))
+        self.assertFalse(is_read_only(reverse('posts:post_create')))
+        self.assertFalse(is_read_only('/нет-такой-страницы/'))
+
+    def test_environ(self):
+        """Заголовки и путь переводятся в WSGI environ."""
+        environ = build_environ({
+            'method': 'POST',
+            'path': '/группа/',
+            'query_string': b'a=1',
+            'headers': [
+                (b'content-type', b'text/plain'),
+                (b'x-forwarded-for', b'1.1.1.1'),
+                (b'x-forwarded-for', b'2.2.2.2'),
+            ],
+        }, b'body')
+        self.assertEqual(environ['CONTENT_TYPE'], 'text/plain')
+        self.assertEqual(environ['HTTP_X_FORWARDED_FOR'], '1.1.1.1,2.2.2.2')
+        self.assertEqual(
+            environ['PATH_INFO'].encode('latin1').decode(), '/группа/')
+        self.assertEqual(environ['QUERY_STRING'], 'a=1')
+        self.assertEqual(environ['wsgi.input'].read(), b'body')
+
+    def test_page_served(self):
+        """Страница отдаётся через ASGI целиком."""
+        sent = request(self.handler, reverse('about:tech'))
+        self.assertEqual(sent[0]['type'], 'http.response.start')
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertIn(
+            (b'content-type', b'text/html; charset=utf-8'), sent[0]['headers'])
+        body = b''.join(message.get('body', b'') for message in sent[1:])
+        self.assertIn(b'<html', body)
+        self.assertFalse(sent[-1].get('more_body', False))
+
+    def test_redirect_from_write_pool(self):
+        """Запрос к закрытой странице выполняется и отвечает редиректом."""
+        sent = request(self.handler, reverse('posts:post_create'))
+        self.assertEqual(sent[0]['status'], 302)
+
+    def test_disconnect_before_body(self):
+        """Если клиент ушёл до конца тела запроса, ответа нет."""
+        sent = run(self.handler, {
+            'type': 'http', 'method': 'POST', 'path': '/',
+        }, [{'type': 'http.disconnect'}])
+        self.assertEqual(sent, [])
+
+    def test_lifespan(self):
+        """Обработчик отвечает на события запуска и остановки."""
+        handler = ASGIHandler(get_wsgi_application(), 1, 1)
+        sent = run(handler, {'type': 'lifespan'}, [
+            {'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}])
+        self.assertEqual([message['type'] for message in sent], [
+            'lifespan.startup.complete', 'lifespan.shutdown.complete'])
@@ -0,0 +1,99 @@
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from ..auth import check_shared_caches, user_cache, user_key
+from posts.models import User
+
+SHARED_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'cache_table',
+    },
+}
+
+
+@override_settings(
+    USER_CACHE='default',
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+)
+class CachedUserTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='auth', password='old-password-123')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        self.url = reverse('about:tech')
+
+    def test_repeated_request_skips_database(self):
+        """Сессия и пользователь читаются из кэша без запросов к базе."""
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.context['user'].username, 'auth')
+
+    def test_password_change_logs_out_other_sessions(self):
+        """После смены пароля старая сессия на другом устройстве
+        перестаёт действовать, а текущая остаётся."""
+        other = Client()
+        other.force_login(self.user)
+        other.get(self.url)
+        response = self.client.post(reverse('users:password_change'), {
+            'old_password': 'old-password-123',
+            'new_password1': 'new-password-456',
+            'new_password2': 'new-password-456',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(
+            self.client.get(self.url).context['user'].is_authenticated)
+        self.assertFalse(
+            other.get(self.url).context['user'].is_authenticated)
+
+    def test_logout_drops_cached_user(self):
+        """Выход удаляет пользователя из кэша."""
+        self.client.get(self.url)
+        self.assertIsNotNone(user_cache().get(user_key(self.user.pk)))
+        self.client.get(reverse('users:logout'))
+        self.assertIsNone(user_cache().get(user_key(self.user.pk)))
+        self.assertFalse(
+            self.client.get(self.url).context['user'].is_authenticated)
+
+    def test_user_save_refreshes_cache(self):
+        """Изменённый пользователь перечитывается из базы."""
+        self.client.get(self.url)
+        User.objects.filter(pk=self.user.pk).update(first_name='Лев')
+        user = User.objects.get(pk=self.user.pk)
+        user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['user'].first_name, 'Лев')
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class SharedCacheCheckTests(SimpleTestCase):
+    def test_disabled_cache_passes(self):
+        self.assertEqual(check_shared_caches(None), [])
+
+    @override_settings(
+        USER_CACHE='default',
+        SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+        SESSION_CACHE_ALIAS='default',
+    )
+    def test_per_process_cache_warns(self):
+        messages = check_shared_caches(None)
+        self.assertEqual([message.id for message in messages],
+                         ['core.W001', 'core.W001'])
+
+    @override_settings(
+        USER_CACHE='shared',
+        SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+        SESSION_CACHE_ALIAS='shared',
+    )
+    def test_shared_cache_passes(self):
+        self.assertEqual(check_shared_caches(None), [])
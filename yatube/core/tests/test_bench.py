@@ -0,0 +1,41 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+
+from ..bench import compare, percentile, summarize
+from posts.models import AuthorStats, Group, Post, User
+
+
+class BenchHelpersTests(TestCase):
+    def test_percentile(self):
+        """Перцентили считаются с интерполяцией."""
+        values = [1, 2, 3, 4, 5]
+        self.assertEqual(percentile(values, 50), 3)
+        self.assertEqual(percentile(values, 100), 5)
+        self.assertAlmostEqual(percentile(values, 95), 4.8)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_compare(self):
+        """Рост p95 сверх допуска и рост числа запросов - регрессии."""
+        baseline = {'views': {'index': {'p95_ms': 10.0, 'queries': 3}}}
+        ok = {'views': {'index': summarize([0.011], [3])}}
+        slow = {'views': {'index': summarize([0.013], [4])}}
+        self.assertEqual(compare(ok, baseline, 0.2), [])
+        self.assertEqual(len(compare(slow, baseline, 0.2)), 2)
+
+
+class BenchCommandsTests(TransactionTestCase):
+    def test_seed_and_bench(self):
+        """seed заполняет базу, bench замеряет страницы на копии базы."""
+        call_command('seed', posts=30, stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 30)
+        self.assertEqual(Group.objects.count(), 1)
+        self.assertEqual(
+            AuthorStats.objects.get(user=User.objects.get()).posts_count, 30)
+        out = StringIO()
+        call_command('bench', requests=2, warmup=0, stdout=out)
+        for view in ('index', 'group_posts', 'profile', 'post_detail',
+                     'post_create'):
+            self.assertIn(f'{view}:', out.getvalue())
+        self.assertEqual(Post.objects.count(), 30)
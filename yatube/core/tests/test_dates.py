@@ -0,0 +1,41 @@
+from django.template import Context, Template
+from django.test import TestCase
+from django.utils import timezone, translation
+
+from ..templatetags.cached_dates import format_date
+
+
+class CachedDateFilterTests(TestCase):
+    def render(self, filter_name, value, format_string='d E Y'):
+        return Template(
+            '{% load cached_dates %}'
+            f'{{{{ value|{filter_name}:"{format_string}" }}}}'
+        ).render(Context({'value': value}))
+
+    def test_matches_builtin_date(self):
+        """cached_date выводит то же, что date, для локали и пояса."""
+        value = timezone.now().replace(hour=23)
+        for language in ('ru', 'en'):
+            for zone in ('UTC', 'Asia/Vladivostok'):
+                for format_string in ('d E Y', 'd E Y H:i', r'\H\i d'):
+                    with self.subTest(language=language, zone=zone,
+                                      format_string=format_string):
+                        with translation.override(language), \
+                                timezone.override(zone):
+                            self.assertEqual(
+                                self.render(
+                                    'cached_date', value, format_string),
+                                self.render('date', value, format_string))
+
+    def test_same_day_is_memoized(self):
+        """Разные моменты одного местного дня делят запись кэша."""
+        format_date.cache_clear()
+        value = timezone.now().replace(hour=12)
+        self.render('cached_date', value)
+        self.render('cached_date', value.replace(hour=13, microsecond=5))
+        self.assertEqual(format_date.cache_info().hits, 1)
+
+    def test_time_formats_are_not_cached(self):
+        format_date.cache_clear()
+        self.render('cached_date', timezone.now(), 'd E Y H:i')
+        self.assertEqual(format_date.cache_info().currsize, 0)
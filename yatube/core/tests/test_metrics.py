@@ -0,0 +1,68 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..metrics import registry
+from posts.models import Post, User
+
+
+@override_settings(METRICS_SAMPLE_RATE=1)
+class RequestMetricsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def setUp(self):
+        registry.clear()
+
+    def test_view_metrics_recorded(self):
+        """Каждый замеренный запрос попадает в гистограммы своего view."""
+        self.client.get(reverse('posts:index'))
+        self.client.get(reverse('posts:index'))
+        histograms = registry.histograms['posts:index']
+        self.assertEqual(histograms['db_queries'].count, 2)
+        self.assertGreater(histograms['db_queries'].sum, 0)
+        self.assertGreater(histograms['template_seconds'].sum, 0)
+        self.assertGreater(histograms['response_bytes'].sum, 0)
+
+    @override_settings(METRICS_SAMPLE_RATE=0)
+    def test_unsampled_requests_skipped(self):
+        """Запросы вне выборки не замеряются."""
+        self.client.get(reverse('posts:index'))
+        self.assertNotIn('posts:index', registry.histograms)
+
+    def test_streamed_response_measured(self):
+        """Запросы потокового ответа учитываются после его отдачи."""
+        response = self.client.get(reverse('posts:api_posts'))
+        self.assertNotIn('posts:api_posts', registry.histograms)
+        b''.join(response.streaming_content)
+        histograms = registry.histograms['posts:api_posts']
+        self.assertGreater(histograms['db_queries'].sum, 0)
+        self.assertGreater(histograms['response_bytes'].sum, 0)
+
+    def test_prometheus_endpoint(self):
+        """Эндпоинт скрыт от всех, включая 127.0.0.1 за прокси."""
+        self.client.get(reverse('posts:index'))
+        url = reverse('core:metrics')
+        self.assertEqual(self.client.get(url).status_code, 404)
+        staff = User.objects.create_user(username='staff', is_staff=True)
+        self.client.force_login(staff)
+        self.assertContains(
+            self.client.get(url),
+            'yatube_view_db_queries_count{view="posts:index"} 1')
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_prometheus_token(self):
+        url = reverse('core:metrics')
+        response = self.client.get(url, HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url, HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(METRICS_ALLOWED_IPS=['10.0.0.1'])
+    def test_prometheus_allowed_ips(self):
+        url = reverse('core:metrics')
+        response = self.client.get(url, REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(url).status_code, 404)
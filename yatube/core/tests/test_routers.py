@@ -0,0 +1,129 @@
+import os
+import sqlite3
+import tempfile
+
+from django.contrib.sessions.models import Session
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.test import override_settings
+from django.urls import resolve, reverse
+
+from ..management.commands.sync_replicas import copy_database
+from ..middleware import ReplicaRoutingMiddleware
+from ..routers import ReplicaRouter, primary_reads, replica_reads
+from posts.groups import registry
+from posts.models import Group, Post, User
+from posts.timelines import build_timeline
+
+router = ReplicaRouter()
+
+
+def read_alias(request):
+    return HttpResponse(router.db_for_read(Post))
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = ReplicaRoutingMiddleware(self.handle)
+
+    def handle(self, request):
+        """Обработчик Django: находит view, вызывает process_view."""
+        match = resolve(request.path_info)
+        self.middleware.process_view(
+            request, match.func, match.args, match.kwargs)
+        return read_alias(request)
+
+    def test_router(self):
+        """С реплик читается только внутри replica_reads(), кроме сессий
+        и блоков primary_reads()."""
+        self.assertEqual(router.db_for_read(Post), 'default')
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Post), 'replica')
+            self.assertEqual(router.db_for_read(Session), 'default')
+            self.assertEqual(router.db_for_write(Post), 'default')
+            with primary_reads():
+                self.assertEqual(router.db_for_read(Post), 'default')
+            self.assertEqual(router.db_for_read(Post), 'replica')
+        self.assertEqual(router.db_for_read(Post), 'default')
+        self.assertFalse(router.allow_migrate('replica', 'posts'))
+
+    def test_read_only_views_use_replicas(self):
+        """GET к view только для чтения читает с реплики."""
+        index = reverse('posts:index')
+        response = self.middleware(self.factory.get(index))
+        self.assertEqual(response.content, b'replica')
+        response = self.middleware(
+            self.factory.get(reverse('posts:post_create')))
+        self.assertEqual(response.content, b'default')
+        response = self.middleware(self.factory.post(index))
+        self.assertEqual(response.content, b'default')
+        self.assertEqual(router.db_for_read(Post), 'default')
+
+    def test_pinned_client_reads_primary(self):
+        """Пока у клиента есть cookie после записи, реплики не читаются."""
+        request = self.factory.get(reverse('posts:index'))
+        request.COOKIES['primary_pin'] = '1'
+        self.assertEqual(self.middleware(request).content, b'default')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas(self):
+        """Без реплик всё читается с default."""
+        request = self.factory.get(reverse('posts:index'))
+        self.assertEqual(self.middleware(request).content, b'default')
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Post), 'default')
+
+
+class ReplicaPinTests(TestCase):
+    @override_settings(DATABASE_REPLICAS=['replica'])
+    def test_write_pins_client_to_primary(self):
+        """После создания поста клиент получает cookie и видит пост."""
+        user = User.objects.create_user(username='auth')
+        self.client.force_login(user)
+        response = self.client.post(
+            reverse('posts:post_create'), data={'text': 'Свежий пост'})
+        self.assertEqual(response.cookies['primary_pin']['max-age'], 10)
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, 'Свежий пост')
+
+    @override_settings(DATABASE_REPLICAS=['replica'])
+    def test_cached_reads_use_primary(self):
+        """Ленты и реестр групп, которые попадают в кэш, читаются с
+        основной базы и внутри replica_reads()."""
+        user = User.objects.create_user(username='auth')
+        post = Post.objects.create(author=user, text='Пост')
+        Group.objects.create(title='Группа', slug='group')
+        registry.clear()
+        with replica_reads():
+            ids, _ = build_timeline(
+                'author', user.pk, Post.objects.filter(author=user))
+            group = registry.get_by_slug('group')
+        self.assertEqual(list(ids), [post.pk])
+        self.assertEqual(group.slug, 'group')
+
+    def test_no_pin_without_replicas(self):
+        """Без реплик cookie не ставится."""
+        response = self.client.post(reverse('users:login'))
+        self.assertNotIn('primary_pin', response.cookies)
+
+
+class SyncReplicasTests(SimpleTestCase):
+    def test_copy_database(self):
+        """Реплика получает копию данных основной базы."""
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'primary.sqlite3')
+            target = os.path.join(directory, 'replica.sqlite3')
+            db = sqlite3.connect(source)
+            db.execute('PRAGMA journal_mode = wal')
+            db.execute('CREATE TABLE post (text TEXT)')
+            db.execute("INSERT INTO post VALUES ('пост')")
+            db.commit()
+            copy_database(source, target)
+            db.close()
+            replica = sqlite3.connect(target)
+            self.assertEqual(
+                replica.execute('SELECT text FROM post').fetchall(),
+                [('пост',)])
+            replica.close()
@@ -0,0 +1,62 @@
+import os
+import sqlite3
+import tempfile
+
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+
+from ..sqlite import apply_pragmas
+
+
+class SQLitePragmaTests(SimpleTestCase):
+    def pragmas(self, *names):
+        """Значения PRAGMA нового соединения с файловой базой."""
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = DatabaseWrapper({
+                **connection.settings_dict,
+                'NAME': os.path.join(directory, 'test.sqlite3'),
+            })
+            try:
+                with wrapper.cursor() as cursor:
+                    values = {}
+                    for name in names:
+                        cursor.execute(f'PRAGMA {name}')
+                        values[name] = cursor.fetchone()[0]
+                    return values
+            finally:
+                wrapper.close()
+
+    def test_connection_configured(self):
+        """Новое соединение получает WAL и PRAGMA из настроек."""
+        self.assertEqual(
+            self.pragmas(
+                'journal_mode', 'synchronous', 'busy_timeout', 'cache_size'),
+            {
+                'journal_mode': 'wal',
+                'synchronous': 1,
+                'busy_timeout': 5000,
+                'cache_size': -64000,
+            },
+        )
+
+    @override_settings(SQLITE_PRAGMAS={'synchronous': 'full'})
+    def test_pragmas_from_settings(self):
+        """Набор PRAGMA задаётся настройкой SQLITE_PRAGMAS."""
+        self.assertEqual(
+            self.pragmas('journal_mode', 'synchronous'),
+            {'journal_mode': 'delete', 'synchronous': 2},
+        )
+
+    def test_rejects_unsafe_values(self):
+        """Имена и значения PRAGMA не подставляются в SQL как есть."""
+        db = sqlite3.connect(':memory:')
+        for pragmas in (
+            {'synchronous': 'off; DROP TABLE x'},
+            {'cache_size; --': 1},
+            {'mmap_size': 1.5},
+        ):
+            with self.subTest(pragmas=pragmas):
+                with self.assertRaises(ValueError):
+                    apply_pragmas(db.cursor(), pragmas)
+        db.close()
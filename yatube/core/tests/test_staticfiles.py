@@ -0,0 +1,85 @@
+import gzip
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import Client, SimpleTestCase, override_settings
+from django.utils.http import http_date
+
+CSS = b'body { color: #333; }\n' * 200
+
+
+class StaticPipelineTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.source = tempfile.mkdtemp()
+        cls.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(cls.source, 'css'))
+        with open(os.path.join(cls.source, 'css', 'site.css'), 'wb') as file:
+            file.write(CSS)
+        with open(os.path.join(cls.source, 'logo.png'), 'wb') as file:
+            file.write(b'\x89PNG' + bytes(range(256)))
+        cls.settings = override_settings(
+            STATICFILES_DIRS=[cls.source],
+            STATIC_ROOT=cls.root,
+            STATICFILES_STORAGE=(
+                'core.staticfiles.CompressedManifestStaticFilesStorage'),
+        )
+        cls.settings.enable()
+        call_command('collectstatic', interactive=False, verbosity=0,
+                     stdout=StringIO())
+        cls.hashed = staticfiles_storage.url('css/site.css')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings.disable()
+        shutil.rmtree(cls.source)
+        shutil.rmtree(cls.root)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_collectstatic_writes_hashed_and_compressed_files(self):
+        self.assertRegex(self.hashed, r'^/static/css/site\.\w{12}\.css$')
+        path = os.path.join(self.root, self.hashed[len('/static/'):])
+        with gzip.open(path + '.gz') as compressed:
+            self.assertEqual(compressed.read(), CSS)
+        self.assertFalse(
+            os.path.exists(os.path.join(self.root, 'logo.png.gz')))
+
+    def test_hashed_file_is_immutable_and_precompressed(self):
+        response = self.client.get(
+            self.hashed, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        body = b''.join(response.streaming_content)
+        self.assertEqual(gzip.decompress(body), CSS)
+
+    def test_plain_file_without_accept_encoding(self):
+        response = self.client.get(self.hashed)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(b''.join(response.streaming_content), CSS)
+
+    def test_gzip_refused_with_zero_quality(self):
+        response = self.client.get(
+            self.hashed, HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_unhashed_name_is_revalidated(self):
+        response = self.client.get('/static/css/site.css')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=3600')
+        response = self.client.get(
+            '/static/css/site.css',
+            HTTP_IF_MODIFIED_SINCE=http_date())
+        self.assertEqual(response.status_code, 304)
+
+    def test_unknown_file_falls_through(self):
+        response = self.client.get('/static/missing.css')
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,116 @@
+from io import StringIO
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Task
+from ..tasks import claim, run_batch, task
+from posts.models import User
+
+CALLS = []
+STOLEN = []
+
+
+@task
+def remember(value):
+    CALLS.append(value)
+
+
+@task(max_attempts=2)
+def broken():
+    raise RuntimeError('сломано')
+
+
+@task(max_attempts=2)
+def stolen(fail):
+    """Аренда истекает во время работы, и задачу забирает другой воркер."""
+    Task.objects.update(run_at=timezone.now())
+    STOLEN[:] = claim(10, lease=60)
+    if fail:
+        raise RuntimeError('сломано')
+
+
+@override_settings(TASKS_EAGER=False)
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_runs_immediately(self):
+        remember.defer([1, 2])
+        self.assertEqual(CALLS, [[1, 2]])
+        self.assertFalse(Task.objects.exists())
+
+    def test_worker_runs_batch_and_deletes_done(self):
+        for value in range(3):
+            remember.defer(value)
+        self.assertEqual(CALLS, [])
+        with self.assertNumQueries(3):
+            self.assertEqual(run_batch(batch_size=10), 3)
+        self.assertEqual(CALLS, [0, 1, 2])
+        self.assertFalse(Task.objects.exists())
+
+    def test_claimed_task_is_not_taken_twice(self):
+        remember.defer('once')
+        self.assertEqual(len(claim(10, lease=60)), 1)
+        self.assertEqual(claim(10, lease=60), [])
+
+    def test_failed_task_is_retried_then_kept(self):
+        broken.defer()
+        with self.assertLogs('core.tasks', 'ERROR'):
+            run_batch()
+        task_row = Task.objects.get()
+        self.assertGreater(task_row.run_at, timezone.now())
+        self.assertIsNone(task_row.failed_at)
+        Task.objects.update(run_at=timezone.now())
+        with self.assertLogs('core.tasks', 'ERROR'):
+            run_batch()
+        task_row.refresh_from_db()
+        self.assertEqual(task_row.attempts, 2)
+        self.assertIsNotNone(task_row.failed_at)
+        self.assertIn('сломано', task_row.last_error)
+        self.assertEqual(run_batch(), 0)
+
+    def test_reclaimed_task_is_left_to_new_worker(self):
+        """Первый воркер не удаляет и не переписывает задачу, которую
+        после истечения аренды забрал другой."""
+        for fail in (False, True):
+            with self.subTest(fail=fail):
+                stolen.defer(fail)
+                if fail:
+                    with self.assertLogs('core.tasks', 'ERROR'):
+                        run_batch()
+                else:
+                    run_batch()
+                task_row = Task.objects.get()
+                self.assertEqual(task_row.locked_by, STOLEN[0].locked_by)
+                self.assertIsNone(task_row.failed_at)
+                self.assertEqual(task_row.last_error, '')
+                task_row.delete()
+
+    def test_command_drains_queue(self):
+        remember.defer('command')
+        call_command('run_tasks', '--burst', stdout=StringIO())
+        self.assertEqual(CALLS, ['command'])
+        self.assertFalse(Task.objects.exists())
+
+
+@override_settings(
+    TASKS_EAGER=False,
+    EMAIL_BACKEND='core.mail.QueuedEmailBackend',
+    TASKS_EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+)
+class QueuedEmailTests(TestCase):
+    def test_password_reset_mail_is_sent_by_worker(self):
+        User.objects.create_user('mail', 'mail@example.com', 'secret')
+        response = self.client.post(
+            reverse('users:password_reset'), {'email': 'mail@example.com'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(mail.outbox, [])
+        run_batch()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['mail@example.com'])
+        self.assertIn('/auth/reset/', mail.outbox[0].body)
@@ -0,0 +1,33 @@
+import copy
+import os
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.template import engines
+from django.test import SimpleTestCase, override_settings
+
+from ..warmup import warm_up
+
+# Свежий движок: без DEBUG Django сам оборачивает загрузчики в cached.Loader.
+CACHED_TEMPLATES = copy.deepcopy(settings.TEMPLATES)
+
+
+class WarmUpTests(SimpleTestCase):
+    @override_settings(TEMPLATES=CACHED_TEMPLATES)
+    def test_project_templates_are_cached(self):
+        stats = warm_up()
+        template_files = sum(
+            len(files) for _, _, files in os.walk(settings.TEMPLATES_DIR))
+        self.assertEqual(stats['templates'], template_files)
+        loader = engines['django'].engine.template_loaders[0]
+        self.assertIn('posts/index.html', loader.get_template_cache)
+        self.assertIn('includes/header.html', loader.get_template_cache)
+
+    def test_all_routes_are_visited(self):
+        self.assertGreater(warm_up()['urls'], 30)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('warmup', stdout=out)
+        self.assertIn('шаблонов', out.getvalue())
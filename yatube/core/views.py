@@ -0,0 +1,29 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from .metrics import registry
+
+
+def metrics(request):
+    """Гистограммы RequestMetricsMiddleware для Prometheus.
+
+    Доступны персоналу, запросам с заголовком
+    Authorization: Bearer METRICS_TOKEN и адресам из METRICS_ALLOWED_IPS.
+    За обратным прокси на том же хосте у всех клиентов REMOTE_ADDR
+    127.0.0.1, поэтому по умолчанию список адресов пуст.
+    """
+    if not (request.user.is_staff or has_metrics_token(request)
+            or request.META.get('REMOTE_ADDR')
+            in settings.METRICS_ALLOWED_IPS):
+        raise Http404
+    return HttpResponse(
+        registry.render(), content_type='text/plain; version=0.0.4')
+
+
+def has_metrics_token(request):
+    token = settings.METRICS_TOKEN
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    return bool(token) and hmac.compare_digest(
+        header.encode(), f'Bearer {token}'.encode())
@@ -0,0 +1,78 @@
+"""Прогрев процесса сервера перед первым запросом.
+
+Django импортирует view, собирает таблицы reverse() и разбирает шаблоны
+при первом обращении, и первые запросы каждого воркера после деплоя
+платят за это. warm_up() делает всё заранее: с кэширующим загрузчиком
+шаблонов (DEBUG = False) разобранные шаблоны остаются в памяти процесса.
+yatube/wsgi.py и yatube/asgi.py вызывают его при WARMUP_ON_START.
+"""
+import os
+import time
+
+from django.conf import settings
+from django.template import engines
+from django.urls import URLPattern, URLResolver, get_resolver
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt', '.xml')
+
+
+def walk_urls(resolver):
+    """Обходит дерево URL: импортирует view и готовит таблицы reverse()
+    каждого include(). Возвращает число маршрутов."""
+    # Ленивые свойства вычисляются и кэшируются при первом чтении.
+    resolver.reverse_dict, resolver.namespace_dict, resolver.app_dict
+    count = 0
+    for pattern in resolver.url_patterns:
+        pattern.pattern.regex
+        if isinstance(pattern, URLResolver):
+            count += walk_urls(pattern)
+        elif isinstance(pattern, URLPattern):
+            pattern.callback
+            count += 1
+    return count
+
+
+def project_template_names(engine):
+    """Имена шаблонов из каталогов проекта; шаблоны сторонних
+    приложений (админки) грузятся при первом обращении."""
+    base_dir = os.path.join(settings.BASE_DIR, '')
+    for directory in engine.template_dirs:
+        if not os.path.join(directory, '').startswith(base_dir):
+            continue
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(TEMPLATE_EXTENSIONS):
+                    path = os.path.join(root, filename)
+                    yield os.path.relpath(path, directory).replace(
+                        os.sep, '/')
+
+
+def load_templates():
+    """Загружает шаблоны проекта во все движки. Возвращает их число.
+
+    Ошибка в шаблоне поднимается сразу, а не на запросе пользователя.
+    """
+    count = 0
+    for engine in engines.all():
+        for name in sorted(set(project_template_names(engine))):
+            engine.get_template(name)
+            count += 1
+    return count
+
+
+def warm_up():
+    """Прогревает процесс. Возвращает число маршрутов и шаблонов и
+    затраченное время в секундах."""
+    start = time.perf_counter()
+    urls = walk_urls(get_resolver())
+    templates = load_templates()
+    return {
+        'urls': urls,
+        'templates': templates,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def warm_up_on_start():
+    if settings.WARMUP_ON_START:
+        warm_up()
@@ -1,6 +1,89 @@
+import datetime
+
 from django.contrib import admin
+from django.contrib.admin.views.autocomplete import AutocompleteJsonView
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Max, Min
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .groups import prefix_filter, registry
+from .models import Group, Post, PostQuerySet
+from .search import match_expression, matching_post_ids
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator без COUNT(*) по всей таблице.
+
+    Для списка без фильтров число строк оценивается наибольшим id - это
+    один шаг по первичному ключу; удалённые посты завышают оценку. При
+    фильтрах и поиске считается точно.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if queryset.query.where:
+            return queryset.count()
+        return queryset.aggregate(estimate=Max('pk'))['estimate'] or 0
+
+
+class DateSeekQuerySet(PostQuerySet):
+    """dates() для date_hierarchy через поиск по индексу pub_date.
+
+    Вместо DISTINCT по усечённой дате всех строк ищется первая дата
+    каждого следующего года, месяца или дня: по запросу MIN на период.
+    """
+
+    def aggregate(self, *args, **kwargs):
+        """SQLite берёт MIN и MAX из индекса, только если агрегат в запросе
+        один, поэтому date_hierarchy получает их отдельными запросами."""
+        if args or len(kwargs) < 2 or not all(
+                isinstance(value, (Min, Max)) for value in kwargs.values()):
+            return super().aggregate(*args, **kwargs)
+        result = {}
+        for name, value in kwargs.items():
+            result.update(super().aggregate(**{name: value}))
+        return result
 
-from .models import Group, Post
+    def dates(self, field_name, kind, order='ASC'):
+        if kind not in ('year', 'month', 'day'):
+            return super().dates(field_name, kind, order)
+        dates = []
+        first = self.aggregate(first=Min(field_name))['first']
+        while first is not None:
+            day = timezone.localtime(first).date()
+            if kind == 'year':
+                day = day.replace(month=1, day=1)
+                following = day.replace(year=day.year + 1)
+            elif kind == 'month':
+                day = day.replace(day=1)
+                following = (day + datetime.timedelta(days=31)).replace(day=1)
+            else:
+                following = day + datetime.timedelta(days=1)
+            dates.append(day)
+            start = timezone.make_aware(
+                datetime.datetime.combine(following, datetime.time()))
+            first = self.filter(**{f'{field_name}__gte': start}).aggregate(
+                first=Min(field_name))['first']
+        return dates if order == 'ASC' else dates[::-1]
+
+
+class GroupAutocompleteSelect(AutocompleteSelect):
+    """Подпись выбранной группы берётся из реестра групп, а не отдельным
+    запросом на каждую строку списка."""
+
+    def optgroups(self, name, value, attr=None):
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, '', '', False, 0))
+        pks = [int(pk) for pk in value if str(pk).isdigit()]
+        for pk, group in sorted(registry.get_many(pks).items()):
+            options.append(self.create_option(
+                name, pk, str(group), str(pk) in value, len(options)))
+        return [(None, options, 0)]
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -12,10 +95,47 @@ class PostAdmin(admin.ModelAdmin):
         'group',
     )
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
+    autocomplete_fields = ('group',)
+    raw_id_fields = ('author',)
     search_fields = ('text',)
     list_filter = ('pub_date',)
+    date_hierarchy = 'pub_date'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     empty_value_display = '-пусто-'
 
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'group':
+            kwargs['widget'] = GroupAutocompleteSelect(
+                db_field.remote_field, self.admin_site,
+                using=kwargs.get('using'))
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return DateSeekQuerySet(
+            model=queryset.model, query=queryset.query, using=queryset.db)
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip() or connection.vendor != 'sqlite':
+            return super().get_search_results(
+                request, queryset, search_term)
+        if not match_expression(search_term):
+            return queryset.none(), False
+        return queryset.filter(pk__in=matching_post_ids(search_term)), False
+
+
+class GroupAutocompleteJsonView(AutocompleteJsonView):
+    """Автодополнение ищет группы по началу названия или слага."""
+
+    def get_queryset(self):
+        queryset = self.model_admin.get_queryset(self.request)
+        term = self.term.strip()
+        if not term:
+            return queryset
+        return queryset.filter(prefix_filter(term))
+
 
 class GroupAdmin(admin.ModelAdmin):
     list_display = (
@@ -25,9 +145,14 @@ class GroupAdmin(admin.ModelAdmin):
     )
     list_editable = ('slug',)
     search_fields = ('title', 'description',)
-    list_filter = ('title',)
+    ordering = ('title',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     empty_value_display = '-пусто-'
 
+    def autocomplete_view(self, request):
+        return GroupAutocompleteJsonView.as_view(model_admin=self)(request)
+
 
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group, GroupAdmin)
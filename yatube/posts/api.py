@@ -0,0 +1,185 @@
+"""JSON API только для чтения: лента, пост, посты группы и автора.
+
+Посты выбираются через .values() без создания моделей. ?fields=id,text
+оставляет в ответе только перечисленные поля, ?limit= задаёт размер
+страницы, ?after= - курсор (pub_date, id) последнего поста предыдущей
+страницы. Списки отдаются потоком, по мере чтения строк из базы.
+"""
+import json
+from functools import wraps
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET
+
+from .groups import registry
+from .models import Post
+from .utils import decode_cursor, encode_cursor
+
+# Поле ответа -> колонка .values(); group берётся из реестра групп.
+FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'author': 'author_username',
+    'group': 'group_id',
+}
+
+
+class BadRequest(Exception):
+    pass
+
+
+def error(message, status=400):
+    return JsonResponse({'error': message}, status=status)
+
+
+def selected_fields(request):
+    value = request.GET.get('fields')
+    if not value:
+        return list(FIELDS)
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in FIELDS]
+    if unknown or not fields:
+        raise BadRequest(
+            'Неизвестные поля: ' + ', '.join(unknown) if unknown
+            else 'Пустой список полей.')
+    return fields
+
+
+def page_limit(request):
+    value = request.GET.get('limit')
+    if value is None:
+        return settings.API_PAGE_SIZE
+    try:
+        limit = int(value)
+    except ValueError:
+        raise BadRequest('limit должен быть числом.')
+    if not 1 <= limit <= settings.API_MAX_PAGE_SIZE:
+        raise BadRequest(
+            f'limit должен быть от 1 до {settings.API_MAX_PAGE_SIZE}.')
+    return limit
+
+
+def load_groups(rows, fields):
+    """{id: Group} для групп строк одним обращением к реестру."""
+    if 'group' not in fields:
+        return {}
+    return registry.get_many(
+        {row['group_id'] for row in rows if row['group_id'] is not None})
+
+
+def serialize(row, fields, groups):
+    item = {}
+    for field in fields:
+        value = row[FIELDS[field]]
+        if field == 'group' and value is not None:
+            group = groups.get(value)
+            value = group.slug if group is not None else None
+        item[field] = value
+    return item
+
+
+def batches(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def dumps(value):
+    return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def stream_page(request, posts, fields, limit):
+    """Страница списка по курсору: {"results": [...], "next": url}."""
+    after = request.GET.get('after')
+    if after:
+        position = decode_cursor(after)
+        if position is None:
+            raise BadRequest('Испорченный курсор.')
+        pub_date, pk = position
+        posts = posts.filter(
+            Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk))
+    columns = {FIELDS[field] for field in fields} | {'id', 'pub_date'}
+    rows = posts.order_by('-pub_date', '-pk').values(*columns)[:limit + 1]
+
+    def chunks():
+        yield '{"results": ['
+        number, last = 0, None
+        for batch in batches(
+                rows.iterator(chunk_size=settings.API_CHUNK_SIZE),
+                settings.API_CHUNK_SIZE):
+            groups = load_groups(batch, fields)
+            for row in batch:
+                if number == limit:
+                    query = request.GET.copy()
+                    query['after'] = encode_cursor(
+                        last['pub_date'], last['id'])
+                    yield '], "next": ' + dumps(
+                        f'{request.path}?{query.urlencode()}') + '}'
+                    return
+                yield (', ' if number else '') + dumps(
+                    serialize(row, fields, groups))
+                number, last = number + 1, row
+        yield '], "next": null}'
+
+    return StreamingHttpResponse(chunks(), content_type='application/json')
+
+
+def api_view(view):
+    """Отвечает на ошибки JSON: 400 для параметров запроса, 404."""
+    @require_GET
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except BadRequest as exc:
+            return error(str(exc))
+        except Http404 as exc:
+            return error(str(exc), status=404)
+    return wrapper
+
+
+@api_view
+def post_list(request):
+    return stream_page(
+        request, Post.objects.all(),
+        selected_fields(request), page_limit(request))
+
+
+@api_view
+def post_detail(request, post_id):
+    fields = selected_fields(request)
+    row = Post.objects.filter(pk=post_id).values(
+        *{FIELDS[field] for field in fields}).first()
+    if row is None:
+        raise Http404('Пост не найден.')
+    return JsonResponse(
+        serialize(row, fields, load_groups([row], fields)),
+        json_dumps_params={'ensure_ascii': False})
+
+
+@api_view
+def group_posts(request, slug):
+    group = registry.get_by_slug(slug)
+    if group is None:
+        raise Http404('Группа не найдена.')
+    return stream_page(
+        request, Post.objects.filter(group_id=group.pk),
+        selected_fields(request), page_limit(request))
+
+
+@api_view
+def author_posts(request, username):
+    author = get_object_or_404(get_user_model(), username=username)
+    return stream_page(
+        request, Post.objects.filter(author_id=author.pk),
+        selected_fields(request), page_limit(request))
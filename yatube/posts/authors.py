@@ -0,0 +1,69 @@
+"""Копия логина и имени автора в Post, чтобы карточки лент не соединяли
+posts_post с auth_user.
+
+Поля заполняются при сохранении и bulk_create поста, а при смене имени
+пользователя их обновляет фоновая задача (posts/tasks.py);
+repair_author_fields чинит расхождения после правок в обход ORM.
+"""
+from django.db.models import CharField, OuterRef, Subquery, Value
+from django.db.models.functions import Concat, Trim
+
+from .models import Post, User
+
+# Поля поста, которых хватает карточке ленты.
+CARD_FIELDS = (
+    'id', 'text', 'pub_date', 'group_id', 'author_id',
+    'author_username', 'author_full_name',
+)
+
+
+def author_fields(user):
+    return user.username, user.get_full_name()
+
+
+def fill_author_fields(posts):
+    """Заполняет поля автора у новых постов; авторов, не загруженных
+    вместе с постами, выбирает одним запросом."""
+    missing = set()
+    for post in posts:
+        if Post.author.is_cached(post):
+            post.author_username, post.author_full_name = author_fields(
+                post.author)
+        elif not post.author_username and post.author_id:
+            missing.add(post.author_id)
+    if not missing:
+        return
+    names = {
+        user.pk: author_fields(user)
+        for user in User.objects.filter(pk__in=missing).only(
+            'username', 'first_name', 'last_name')
+    }
+    for post in posts:
+        if post.author_id in names and not post.author_username:
+            post.author_username, post.author_full_name = names[
+                post.author_id]
+
+
+def sync_author_fields(user):
+    """Переписывает логин и имя пользователя во всех его постах."""
+    username, full_name = author_fields(user)
+    return Post.objects.filter(author_id=user.pk).exclude(
+        author_username=username, author_full_name=full_name,
+    ).update(author_username=username, author_full_name=full_name)
+
+
+def repair_author_fields(post_model=Post, user_model=User):
+    """Исправляет посты, поля автора которых не совпадают с auth_user.
+
+    Модели передаются параметрами, чтобы функцию могла вызвать миграция.
+    Возвращает число исправленных постов.
+    """
+    users = user_model.objects.filter(pk=OuterRef('author_id'))
+    username = Subquery(users.values('username')[:1])
+    full_name = Subquery(users.annotate(full_name=Trim(Concat(
+        'first_name', Value(' '), 'last_name',
+        output_field=CharField(),
+    ))).values('full_name')[:1])
+    return post_model.objects.exclude(
+        author_username=username, author_full_name=full_name,
+    ).update(author_username=username, author_full_name=full_name)
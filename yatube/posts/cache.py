@@ -0,0 +1,222 @@
+import hashlib
+import time
+import zlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from core.routers import primary_reads, reading_replicas
+
+CARD_TEMPLATE = 'posts/includes/post_card.html'
+CARD_VARIANTS = ((False, False), (False, True), (True, False), (True, True))
+
+
+def card_cache():
+    return caches[settings.POST_CARD_CACHE]
+
+
+def card_key(post, show_author_link, show_group_link):
+    """Ключ карточки: id поста и версия, которую сигналы не отслеживают.
+
+    group_id входит в версию, потому что удаление группы обнуляет его
+    UPDATE-запросом без post_save, а подпись автора - потому что смена
+    имени переписывает её в постах тоже через UPDATE.
+    """
+    author = zlib.crc32(
+        f'{post.author_username}|{post.author_full_name}'.encode())
+    version = (
+        f'{int(post.pub_date.timestamp() * 10**6)}-{post.group_id}-{author}')
+    variant = f'{show_author_link:d}{show_group_link:d}'
+    return f'post_card:{post.pk}:{version}:{variant}'
+
+
+def group_generation_key(group_id):
+    return f'post_card_group:{group_id}'
+
+
+def render_post_card(post, show_author_link=False, show_group_link=False):
+    """Отрисовывает карточку поста, беря HTML из кэша, если он актуален.
+
+    Вместе с HTML хранится поколение группы поста: переименование группы
+    меняет поколение, и все её карточки отрисовываются заново.
+    """
+    cache = card_cache()
+    key = card_key(post, show_author_link, show_group_link)
+    group_key = group_generation_key(post.group_id)
+    cached = cache.get_many([key, group_key] if post.group_id else [key])
+    generation = cached.get(group_key)
+    if post.group_id and generation is None:
+        generation = time.time_ns()
+        cache.add(group_key, generation, None)
+    if key in cached and cached[key][0] == generation:
+        return mark_safe(cached[key][1])
+    html = render_to_string(CARD_TEMPLATE, {
+        'post': post,
+        'show_author_link': show_author_link,
+        'show_group_link': show_group_link,
+    })
+    cache.set(key, (generation, html), settings.POST_CARD_CACHE_TIMEOUT)
+    return mark_safe(html)
+
+
+def invalidate_post_card(post):
+    card_cache().delete_many(
+        [card_key(post, *variant) for variant in CARD_VARIANTS]
+    )
+
+
+def invalidate_group_cards(group_id):
+    card_cache().set(group_generation_key(group_id), time.time_ns(), None)
+
+
+def page_cache():
+    return caches[settings.PAGE_CACHE_ALIAS]
+
+
+def feed_generation_key(scope):
+    return f'feed_generation:{scope}'
+
+
+def generations(cache, keys, cached):
+    """Поколения по ключам из cached; вытесненные из кэша заводятся
+    заново."""
+    result = []
+    for key in keys:
+        generation = cached.get(key)
+        if generation is None:
+            generation = time.time_ns()
+            if not cache.add(key, generation, None):
+                generation = cache.get(key, generation)
+        result.append(generation)
+    return tuple(result)
+
+
+def feed_generations(scopes):
+    keys = [feed_generation_key(scope) for scope in scopes]
+    cache = page_cache()
+    return generations(cache, keys, cache.get_many(keys))
+
+
+def page_scopes(scope, kwargs):
+    """Области страницы: шаблон вида 'group:{slug}' или функция от
+    аргументов view, возвращающая список областей."""
+    if callable(scope):
+        return scope(**kwargs)
+    return [scope.format(**kwargs)]
+
+
+def author_posts_scope(author_id):
+    return f'author_posts:{author_id}'
+
+
+def post_author_key(post_id):
+    return f'post_author:{post_id}'
+
+
+def post_scopes(post_id):
+    """Области страницы поста: сам пост и посты его автора - страница
+    показывает их число и подпись автора. id автора поста запоминается в
+    кэше."""
+    from .models import Post
+
+    cache = page_cache()
+    author_id = cache.get(post_author_key(post_id))
+    if author_id is None:
+        with primary_reads():
+            author_id = Post.objects.filter(pk=post_id).values_list(
+                'author_id', flat=True).first()
+        if author_id is None:
+            return [f'post:{post_id}']
+        cache.set(post_author_key(post_id), author_id, None)
+    return [f'post:{post_id}', author_posts_scope(author_id)]
+
+
+def bump_feed_generations(post, old_group_id=None, author_posts=False):
+    """Сбрасывает страницы ленты, на которых виден пост.
+
+    Затрагиваются только главная, страницы группы поста (и прежней группы
+    при смене), автора и самого поста. С author_posts - и страницы всех
+    постов автора: число его постов изменилось.
+    """
+    from .groups import registry
+
+    scopes = ['index', f'author:{post.author_username}', f'post:{post.pk}']
+    if author_posts:
+        scopes.append(author_posts_scope(post.author_id))
+    groups = registry.get_many(
+        pk for pk in (post.group_id, old_group_id) if pk)
+    scopes += [f'group:{group.slug}' for group in groups.values()]
+    bump_scopes(scopes)
+
+
+def bump_scopes(scopes):
+    generation = time.time_ns()
+    page_cache().set_many(
+        {feed_generation_key(scope): generation for scope in scopes}, None
+    )
+
+
+def cache_anonymous_page(scope):
+    """Кэширует страницу для анонимных посетителей.
+
+    scope - области инвалидации, см. page_scopes(): шаблон 'group:{slug}'
+    заполняется аргументами view. Копия считается свежей
+    PAGE_CACHE_TIMEOUT секунд и пока не сменились поколения областей;
+    устаревшую копию отдают остальным посетителям, пока один процесс
+    пересобирает страницу. Страница,
+    собранная с реплик, свежа не дольше REPLICA_PIN_SECONDS - времени, на
+    которое реплика может отстать.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (not settings.PAGE_CACHE or request.method != 'GET'
+                    or request.user.is_authenticated):
+                return view(request, *args, **kwargs)
+            cache = page_cache()
+            scope_keys = [feed_generation_key(item)
+                          for item in page_scopes(scope, kwargs)]
+            path = request.get_full_path().encode()
+            page_key = f'page:{hashlib.md5(path).hexdigest()}'
+            lock_key = f'{page_key}:lock'
+            cached = cache.get_many([page_key, *scope_keys])
+            generation = generations(cache, scope_keys, cached)
+            entry = cached.get(page_key)
+            locked = False
+            if entry is not None:
+                if (entry['generation'] == generation
+                        and entry['expires'] > time.time()):
+                    return _cached_response(entry)
+                locked = cache.add(
+                    lock_key, True, settings.PAGE_CACHE_LOCK_TIMEOUT)
+                if not locked:
+                    return _cached_response(entry)
+            try:
+                response = view(request, *args, **kwargs)
+                if response.status_code == 200 and not response.cookies:
+                    cache.set(page_key, {
+                        'generation': generation,
+                        'expires': time.time() + _fresh_seconds(),
+                        'content': response.content,
+                        'content_type': response['Content-Type'],
+                    }, settings.PAGE_CACHE_STALE_TIMEOUT)
+            finally:
+                if locked:
+                    cache.delete(lock_key)
+            return response
+        return wrapper
+    return decorator
+
+
+def _fresh_seconds():
+    if reading_replicas():
+        return min(settings.PAGE_CACHE_TIMEOUT, settings.REPLICA_PIN_SECONDS)
+    return settings.PAGE_CACHE_TIMEOUT
+
+
+def _cached_response(entry):
+    return HttpResponse(entry['content'], content_type=entry['content_type'])
@@ -0,0 +1,103 @@
+"""Условный GET для лент: ETag и Last-Modified без отрисовки страницы.
+
+Валидаторы строятся из поколений областей страничного кэша (меняются при
+сохранении и удалении поста, см. signals.py) и даты самого свежего
+поста - это один запрос по индексу (group_id|author_id, pub_date),
+результат которого кэшируется; он читается с основной базы.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from core.routers import primary_reads
+
+from .cache import feed_generations, page_cache, page_scopes
+from .groups import registry
+from .models import Post
+
+
+def newest_pub_date(posts):
+    return posts.aggregate(newest=Max('pub_date'))['newest']
+
+
+def index_changed():
+    return newest_pub_date(Post.objects.all())
+
+
+def group_changed(slug):
+    group = registry.get_by_slug(slug)
+    if group is None:
+        return None
+    return newest_pub_date(Post.objects.filter(group_id=group.pk))
+
+
+def author_changed(username):
+    return newest_pub_date(Post.objects.filter(author__username=username))
+
+
+def post_changed(post_id):
+    """Страница поста показывает и число постов автора."""
+    return newest_pub_date(Post.objects.filter(author__posts=post_id))
+
+
+def feed_validators(request, scopes, changed):
+    """Возвращает (etag, last_modified) для страницы ленты.
+
+    Дата свежего поста запоминается в кэше на PAGE_CACHE_TIMEOUT секунд.
+    Сохранение и удаление поста меняют поколение; дата нужна для записей
+    в обход сигналов, например UPDATE через queryset.
+    last_modified - unix-время или None: авторизованным страница
+    показывается по-своему, для них сравнивается только ETag, в который
+    входит id пользователя.
+    """
+    generations = feed_generations(scopes)
+    key = f'feed_newest:{scopes[0]}'
+    cached = page_cache().get(key)
+    if cached is not None:
+        newest = cached[0]
+    else:
+        with primary_reads():
+            newest = changed()
+        page_cache().set(key, (newest,), settings.PAGE_CACHE_TIMEOUT)
+    user = getattr(request, 'user', None)
+    user_id = user.pk if user is not None and user.is_authenticated else ''
+    generation = '-'.join(map(str, generations))
+    raw = f'{generation}|{newest}|{user_id}|{request.get_full_path()}'
+    etag = f'"{hashlib.md5(raw.encode()).hexdigest()}"'
+    if user_id:
+        return etag, None
+    last_modified = max(generations) // 10 ** 9
+    if newest is not None:
+        last_modified = max(last_modified, int(newest.timestamp()))
+    return etag, last_modified
+
+
+def conditional_feed(scope, changed):
+    """Отвечает 304 Not Modified, если лента не менялась.
+
+    scope - области, как в cache_anonymous_page; changed - функция
+    от аргументов view, возвращающая дату самого свежего поста.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            etag, last_modified = feed_validators(
+                request, page_scopes(scope, kwargs),
+                lambda: changed(**kwargs))
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                response['ETag'] = etag
+                if last_modified is not None:
+                    response['Last-Modified'] = http_date(last_modified)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,104 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+
+from .authors import CARD_FIELDS
+from .groups import registry
+from .models import Post
+
+
+class PostsFeed(Feed):
+    """RSS последних постов сайта."""
+
+    title = 'Yatube: последние записи'
+    description = 'Новые записи всех авторов.'
+
+    def link(self):
+        return reverse('posts:index')
+
+    def posts(self, obj):
+        return Post.objects.only(*CARD_FIELDS)
+
+    def items(self, obj):
+        return self.posts(obj).order_by(
+            '-pub_date', '-pk')[:settings.FEED_ITEMS]
+
+    def item_title(self, item):
+        return Truncator(item.text).words(10)
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', args=(item.pk,))
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_author_name(self, item):
+        return item.author_full_name or item.author_username
+
+
+class GroupFeed(PostsFeed):
+    """RSS последних постов группы."""
+
+    def get_object(self, request, slug):
+        group = registry.get_by_slug(slug)
+        if group is None:
+            raise Http404('Группа не найдена.')
+        return group
+
+    def title(self, obj):
+        return f'Yatube: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('posts:group_list', args=(obj.slug,))
+
+    def posts(self, obj):
+        return Post.objects.only(*CARD_FIELDS).filter(group_id=obj.pk)
+
+
+class AuthorFeed(PostsFeed):
+    """RSS последних постов автора."""
+
+    def get_object(self, request, username):
+        return get_object_or_404(get_user_model(), username=username)
+
+    def title(self, obj):
+        return f'Yatube: {obj.get_full_name() or obj.username}'
+
+    def description(self, obj):
+        return f'Записи пользователя {obj.username}.'
+
+    def link(self, obj):
+        return reverse('posts:profile', args=(obj.username,))
+
+    def posts(self, obj):
+        return obj.posts.only(*CARD_FIELDS)
+
+
+class PostsAtomFeed(PostsFeed):
+    feed_type = Atom1Feed
+    subtitle = PostsFeed.description
+
+
+class GroupAtomFeed(GroupFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class AuthorAtomFeed(AuthorFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
@@ -1,17 +1,70 @@
 from django import forms
+from django.urls import reverse
 
-from .models import Post
+from .models import Group, Post
+
+
+class GroupAutocompleteWidget(forms.Select):
+    """Select, в который отрисовывается только выбранная группа.
+
+    Остальные варианты подгружает скрипт страницы из
+    posts:group_autocomplete, поэтому форма не читает всю таблицу групп.
+    """
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-autocomplete-url'] = reverse(
+            'posts:group_autocomplete')
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        iterator = self.choices
+        selected = iterator.queryset.filter(
+            pk__in=[pk for pk in value if str(pk).isdigit()])
+        self.choices = [
+            ('', iterator.field.empty_label),
+            *(iterator.choice(group) for group in selected),
+        ]
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = iterator
 
 
 class PostForm(forms.ModelForm):
+    # Группы нет в Meta.fields: ModelChoiceField уже загрузил её по pk, а
+    # проверка ForeignKey в full_clean была бы вторым запросом. Пост
+    # получает группу в clean_group.
+    group = forms.ModelChoiceField(
+        queryset=Group.objects.all(),
+        required=False,
+        widget=GroupAutocompleteWidget(),
+        label='Группа',
+        help_text='Выберите группу, к которой будет относиться пост',
+    )
+
     class Meta:
         model = Post
-        fields = ("text", "group")
+        fields = ("text",)
         labels = {
             'text': 'Текст поста',
-            'group': 'Группа',
         }
         help_texts = {
             'text': 'Введите текст поста',
-            'group': 'Выберите группу, к которой будет относиться пост',
         }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.initial.setdefault('group', self.instance.group_id)
+
+    def clean_group(self):
+        group = self.cleaned_data['group']
+        self.instance.group = group
+        return group
+
+
+class SearchForm(forms.Form):
+    q = forms.CharField(label='Поиск', max_length=200)
+    group = forms.SlugField(label='Слаг группы', required=False)
+    author = forms.CharField(
+        label='Имя пользователя', max_length=150, required=False)
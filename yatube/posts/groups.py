@@ -0,0 +1,152 @@
+"""Реестр групп: кэш Group по id и slug в памяти процесса и в общем кэше.
+
+Локальная копия живёт GROUP_REGISTRY_TTL секунд и вытесняется по LRU
+после GROUP_REGISTRY_SIZE записей, копия в кэше GROUP_CACHE -
+GROUP_CACHE_TIMEOUT секунд. Сигналы сохранения и удаления Group
+сбрасывают обе копии. Группы читаются с основной базы: копия с отстающей
+реплики вернула бы в кэш только что сброшенную группу.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Q
+
+from core.routers import primary_reads
+
+from .models import Group
+
+
+def group_cache():
+    return caches[settings.GROUP_CACHE]
+
+
+def id_key(pk):
+    return f'group:id:{pk}'
+
+
+def slug_key(slug):
+    return f'group:slug:{slug}'
+
+
+class GroupRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.groups = OrderedDict()
+        self.slugs = {}
+
+    def get(self, pk):
+        return self.get_many([pk]).get(pk)
+
+    def get_many(self, pks):
+        """Словарь {id: Group}; отсутствующие в базе id пропускаются."""
+        found = {}
+        for pk in set(pks):
+            group = self._local(pk)
+            if group is not None:
+                found[pk] = group
+        missing = [pk for pk in set(pks) if pk not in found]
+        if missing:
+            cached = group_cache().get_many([id_key(pk) for pk in missing])
+            for group in cached.values():
+                found[group.pk] = group
+                self._remember(group)
+            missing = [pk for pk in missing if pk not in found]
+        if missing:
+            with primary_reads():
+                groups = list(Group.objects.filter(pk__in=missing))
+            for group in groups:
+                found[group.pk] = group
+                self._store(group)
+        return found
+
+    def get_by_slug(self, slug):
+        with self.lock:
+            pk = self.slugs.get(slug)
+        group = self._local(pk) if pk is not None else None
+        if group is not None and group.slug == slug:
+            return group
+        pk = group_cache().get(slug_key(slug))
+        group = self.get(pk) if pk is not None else None
+        if group is not None and group.slug == slug:
+            return group
+        with primary_reads():
+            group = Group.objects.filter(slug=slug).first()
+        if group is not None:
+            self._store(group)
+        return group
+
+    def invalidate(self, pk, slugs=()):
+        with self.lock:
+            self.groups.pop(pk, None)
+            stale = [slug for slug, owner in self.slugs.items() if owner == pk]
+            for slug in [*slugs, *stale]:
+                self.slugs.pop(slug, None)
+        group_cache().delete_many(
+            [id_key(pk), *(slug_key(slug) for slug in slugs)])
+
+    def clear(self):
+        with self.lock:
+            self.groups.clear()
+            self.slugs.clear()
+
+    def _local(self, pk):
+        with self.lock:
+            entry = self.groups.get(pk)
+            if entry is None:
+                return None
+            expires, group = entry
+            if expires < time.monotonic():
+                del self.groups[pk]
+                self.slugs.pop(group.slug, None)
+                return None
+            self.groups.move_to_end(pk)
+            return group
+
+    def _remember(self, group):
+        with self.lock:
+            self.groups[group.pk] = (
+                time.monotonic() + settings.GROUP_REGISTRY_TTL, group)
+            self.groups.move_to_end(group.pk)
+            self.slugs[group.slug] = group.pk
+            while len(self.groups) > settings.GROUP_REGISTRY_SIZE:
+                _, (_, old) = self.groups.popitem(last=False)
+                if self.slugs.get(old.slug) == old.pk:
+                    del self.slugs[old.slug]
+
+    def _store(self, group):
+        self._remember(group)
+        group_cache().set_many({
+            id_key(group.pk): group,
+            slug_key(group.slug): group.pk,
+        }, settings.GROUP_CACHE_TIMEOUT)
+
+
+registry = GroupRegistry()
+
+
+PREFIX_END = '\U0010ffff'
+
+
+def prefix_filter(query):
+    """Группы, название или слаг которых начинаются с query: диапазон по
+    индексам title и slug вместо LIKE по всей таблице."""
+    slug = query.lower()
+    return (
+        Q(title__gte=query, title__lt=query + PREFIX_END)
+        | Q(slug__gte=slug, slug__lt=slug + PREFIX_END)
+    )
+
+
+def attach_groups(page_obj):
+    """Подставляет постам страницы группы из реестра вместо JOIN."""
+    posts = list(page_obj.object_list)
+    groups = registry.get_many(
+        {post.group_id for post in posts if post.group_id})
+    for post in posts:
+        if post.group_id in groups:
+            post.group = groups[post.group_id]
+    page_obj.object_list = posts
+    return page_obj
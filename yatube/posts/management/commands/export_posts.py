@@ -0,0 +1,29 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from posts.transfer import export_rows, write_rows
+
+
+class Command(BaseCommand):
+    help = 'Выгружает посты в JSON Lines или CSV потоком.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default='-',
+            help='Файл назначения, по умолчанию stdout.')
+        parser.add_argument(
+            '--format', choices=('jsonl', 'csv'),
+            help='По умолчанию - по расширению файла, иначе jsonl.')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or (
+            'csv' if path.endswith('.csv') else 'jsonl')
+        rows = export_rows(options['chunk_size'])
+        if path == '-':
+            write_rows(sys.stdout, fmt, rows)
+            return
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            write_rows(file, fmt, rows)
@@ -0,0 +1,42 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from posts.transfer import import_rows, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает посты из JSON Lines или CSV пачками bulk_create. '
+        'Поля: text, pub_date, author (username), group (slug).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default='-',
+            help='Исходный файл, по умолчанию stdin.')
+        parser.add_argument(
+            '--format', choices=('jsonl', 'csv'),
+            help='По умолчанию - по расширению файла, иначе jsonl.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or (
+            'csv' if path.endswith('.csv') else 'jsonl')
+        if path == '-':
+            created, skipped, errors = import_rows(
+                read_rows(sys.stdin, fmt), options['batch_size'])
+        else:
+            with open(path, encoding='utf-8', newline='') as file:
+                created, skipped, errors = import_rows(
+                    read_rows(file, fmt), options['batch_size'])
+        for number, message in errors:
+            self.stderr.write(f'Запись {number}: {message}.')
+        self.stdout.write(self.style.SUCCESS(f'Загружено постов: {created}.'))
+        if skipped:
+            self.stdout.write(self.style.WARNING(
+                f'Пропущено строк с неизвестным автором: {skipped}.'))
+        if errors:
+            self.stdout.write(self.style.WARNING(
+                f'Пропущено неверных строк: {len(errors)}.'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from posts.stats import rebuild_author_stats
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает количество постов каждого автора (AuthorStats).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = rebuild_author_stats(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитана статистика {total} пользователей.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from posts.search import install_search_index
+
+
+class Command(BaseCommand):
+    help = 'Пересоздаёт триггеры и перестраивает индекс FTS5 по постам.'
+
+    def handle(self, *args, **options):
+        install_search_index()
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс перестроен.'))
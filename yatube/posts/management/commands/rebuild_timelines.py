@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import Group, Post, User
+from posts.timelines import build_timeline
+
+
+class Command(BaseCommand):
+    help = 'Заново собирает материализованные ленты групп и авторов.'
+
+    def handle(self, *args, **options):
+        groups = Group.objects.values_list('pk', flat=True)
+        for pk in groups.iterator():
+            build_timeline('group', pk, Post.objects.filter(group_id=pk))
+        authors = User.objects.filter(
+            stats__posts_count__gt=0).values_list('pk', flat=True)
+        for pk in authors.iterator():
+            build_timeline('author', pk, Post.objects.filter(author_id=pk))
+        self.stdout.write(self.style.SUCCESS(
+            f'Собраны ленты: групп {groups.count()}, '
+            f'авторов {authors.count()}.'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from posts.authors import repair_author_fields
+
+
+class Command(BaseCommand):
+    help = (
+        'Сверяет логин и имя автора, скопированные в посты, с auth_user и '
+        'исправляет расхождения.'
+    )
+
+    def handle(self, *args, **options):
+        fixed = repair_author_fields()
+        self.stdout.write(self.style.SUCCESS(f'Исправлено постов: {fixed}.'))
@@ -0,0 +1,66 @@
+# Generated by Django 2.2.16 on 2026-10-18 06:20
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import CharField, OuterRef, Subquery, Value
+from django.db.models.functions import Concat, Trim
+
+FTS_TABLE = 'posts_post_fts'
+TRIGGERS_SQL = (
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON posts_post "
+    f"BEGIN INSERT INTO {FTS_TABLE}(rowid, text) "
+    f"VALUES (new.id, new.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON posts_post "
+    f"BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) "
+    f"VALUES ('delete', old.id, old.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au "
+    f"AFTER UPDATE OF text ON posts_post "
+    f"BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) "
+    f"VALUES ('delete', old.id, old.text); "
+    f"INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text); END",
+)
+
+
+def fill_author_fields(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    users = User.objects.filter(pk=OuterRef('author_id'))
+    Post.objects.update(
+        author_username=Subquery(users.values('username')[:1]),
+        author_full_name=Subquery(users.annotate(full_name=Trim(Concat(
+            'first_name', Value(' '), 'last_name',
+            output_field=CharField(),
+        ))).values('full_name')[:1]),
+    )
+
+
+def reinstall_search_index(apps, schema_editor):
+    # SQLite пересоздаёт posts_post при добавлении полей и теряет триггеры
+    # индекса FTS; содержимое индекса не меняется.
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in TRIGGERS_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0006_group_title_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='author_full_name',
+            field=models.CharField(blank=True, editable=False, max_length=300, verbose_name='Имя автора'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='author_username',
+            field=models.CharField(blank=True, editable=False, max_length=150, verbose_name='Логин автора'),
+        ),
+        migrations.RunPython(reinstall_search_index, migrations.RunPython.noop),
+        migrations.RunPython(fill_author_fields, migrations.RunPython.noop),
+    ]
@@ -18,11 +18,23 @@ class Group(models.Model):
     class Meta:
         verbose_name = 'Группа'
         verbose_name_plural = 'Группы'
+        indexes = (
+            models.Index(fields=('title',), name='group_title_idx'),
+        )
 
     def __str__(self) -> str:
         return self.title
 
 
+class PostQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        from .authors import fill_author_fields
+
+        objs = list(objs)
+        fill_author_fields(objs)
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 class Post(models.Model):
     text = models.TextField(
         'Текст поста',
@@ -47,11 +59,56 @@ class Post(models.Model):
         verbose_name='Группа',
         help_text='Группа, к которой будет относиться пост'
     )
+    author_username = models.CharField(
+        'Логин автора',
+        max_length=150,
+        blank=True,
+        editable=False,
+    )
+    author_full_name = models.CharField(
+        'Имя автора',
+        max_length=300,
+        blank=True,
+        editable=False,
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Post'
         verbose_name_plural = 'Posts'
         ordering = ('-pub_date', )
+        indexes = (
+            models.Index(fields=('pub_date',), name='post_pub_date_idx'),
+            models.Index(
+                fields=('group', 'pub_date'),
+                name='post_group_pub_date_idx',
+            ),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='post_author_pub_date_idx',
+            ),
+        )
 
     def __str__(self) -> str:
         return self.text[:15]
+
+
+class AuthorStats(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='stats',
+        verbose_name='Автор'
+    )
+    posts_count = models.PositiveIntegerField(
+        'Количество постов',
+        default=0
+    )
+
+    class Meta:
+        verbose_name = 'Статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+    def __str__(self) -> str:
+        return f'{self.user}: {self.posts_count}'
@@ -0,0 +1,148 @@
+import re
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Group, Post, User
+
+FTS_TABLE = 'posts_post_fts'
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+INSTALL_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"text, content='posts_post', content_rowid='id')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON posts_post "
+    f"BEGIN INSERT INTO {FTS_TABLE}(rowid, text) "
+    f"VALUES (new.id, new.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON posts_post "
+    f"BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) "
+    f"VALUES ('delete', old.id, old.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au "
+    f"AFTER UPDATE OF text ON posts_post "
+    f"BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) "
+    f"VALUES ('delete', old.id, old.text); "
+    f"INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text); END",
+)
+REBUILD_SQL = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+UNINSTALL_SQL = (
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+)
+
+
+def install_search_index(schema_editor=None, rebuild=True):
+    """Создаёт индекс FTS5 над Post.text и триггеры синхронизации.
+
+    SQLite теряет триггеры, когда миграция пересоздаёт posts_post, поэтому
+    миграции, меняющие Post, должны вызывать эту функцию повторно.
+    """
+    db = schema_editor.connection if schema_editor else connection
+    if db.vendor != 'sqlite':
+        return
+    with db.cursor() as cursor:
+        for sql in INSTALL_SQL:
+            cursor.execute(sql)
+        if rebuild:
+            cursor.execute(REBUILD_SQL)
+
+
+def uninstall_search_index(schema_editor=None):
+    db = schema_editor.connection if schema_editor else connection
+    if db.vendor != 'sqlite':
+        return
+    with db.cursor() as cursor:
+        for sql in UNINSTALL_SQL:
+            cursor.execute(sql)
+
+
+def match_expression(query):
+    """Переводит пользовательский запрос в безопасное выражение MATCH:
+    все слова обязательны, последнее ищется по префиксу."""
+    words = re.findall(r'\w+', query)
+    if not words:
+        return ''
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def matching_post_ids(query):
+    """Подзапрос id постов, подходящих под query, для .filter(pk__in=...)."""
+    return RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+        (match_expression(query),),
+    )
+
+
+def highlight(snippet):
+    return mark_safe(
+        escape(snippet)
+        .replace(MARK_START, '<mark>')
+        .replace(MARK_END, '</mark>')
+    )
+
+
+class SearchResults:
+    """Результаты полнотекстового поиска, упорядоченные по рангу bm25.
+
+    Поддерживает count() и срезы, поэтому подходит для Paginator: каждая
+    страница - один запрос к индексу и один in_bulk по найденным id.
+    """
+
+    def __init__(self, query, group=None, author=None):
+        self.match = match_expression(query)
+        joins = [f'JOIN {Post._meta.db_table} p ON p.id = f.rowid']
+        where = [f'{FTS_TABLE} MATCH %s']
+        self.params = [self.match]
+        if group:
+            joins.append(
+                f'JOIN {Group._meta.db_table} g ON g.id = p.group_id')
+            where.append('g.slug = %s')
+            self.params.append(group)
+        if author:
+            joins.append(
+                f'JOIN {User._meta.db_table} u ON u.id = p.author_id')
+            where.append('u.username = %s')
+            self.params.append(author)
+        self.sql_from = (
+            f'FROM {FTS_TABLE} f {" ".join(joins)} WHERE {" AND ".join(where)}'
+        )
+
+    def count(self):
+        if not self.match:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) {self.sql_from}', self.params)
+            return cursor.fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        if not self.match:
+            return []
+        offset = index.start or 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT f.rowid, snippet({FTS_TABLE}, 0, %s, %s, '…', 24) "
+                f'{self.sql_from} ORDER BY f.rank LIMIT %s OFFSET %s',
+                [MARK_START, MARK_END, *self.params,
+                 index.stop - offset, offset],
+            )
+            rows = cursor.fetchall()
+        posts = Post.objects.select_related('group').in_bulk(
+            [pk for pk, _ in rows])
+        results = []
+        for pk, snippet in rows:
+            if pk in posts:
+                post = posts[pk]
+                post.snippet = highlight(snippet)
+                results.append(post)
+        return results
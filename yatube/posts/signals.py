@@ -0,0 +1,131 @@
+from django.db import transaction
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_save)
+from django.dispatch import receiver
+
+from .authors import author_fields, fill_author_fields
+from .cache import (bump_feed_generations, bump_scopes,
+                    invalidate_group_cards, invalidate_post_card, page_cache,
+                    post_author_key)
+from .groups import registry
+from .models import Group, Post, User
+from .stats import change_posts_count
+from .tasks import sync_user_posts
+from .timelines import move_post, push_post, remove_post
+
+AUTHOR_NAME_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+@receiver(pre_save, sender=Post)
+def copy_author_fields(sender, instance, **kwargs):
+    fill_author_fields([instance])
+
+
+@receiver(post_init, sender=Post)
+def remember_post_group(sender, instance, **kwargs):
+    if 'group_id' not in instance.get_deferred_fields():
+        instance._saved_group_id = instance.group_id
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def drop_post_card(sender, instance, **kwargs):
+    invalidate_post_card(instance)
+
+
+@receiver(post_save, sender=Post)
+def update_timelines(sender, instance, created, **kwargs):
+    """Новый пост любым путём попадает в начало лент, перенесённый в
+    другую группу - в её ленту. Приёмник подключён раньше
+    bump_post_pages, который обновляет снимок _saved_group_id."""
+    if created:
+        push_post(instance)
+    else:
+        move_post(instance, getattr(instance, '_saved_group_id', None))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def bump_post_pages(sender, instance, **kwargs):
+    """Правка или удаление поста любым путём - через сайт, админку или
+    ORM - меняет поколение его страниц, а с ним ETag и страничный кэш.
+
+    Создание и удаление меняют и число постов автора на страницах всех
+    его постов.
+    """
+    created = kwargs.get('created', False)
+    deleted = kwargs['signal'] is post_delete
+    bump_feed_generations(
+        instance, getattr(instance, '_saved_group_id', None),
+        author_posts=created or deleted)
+    if not created:
+        # Автора поста могли сменить в админке.
+        page_cache().delete(post_author_key(instance.pk))
+    instance._saved_group_id = instance.group_id
+
+
+@receiver(post_save, sender=Post)
+def count_created_post(sender, instance, created, **kwargs):
+    if created:
+        change_posts_count(instance.author_id, 1)
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    change_posts_count(instance.author_id, -1)
+
+
+@receiver(post_delete, sender=Post)
+def drop_from_timelines(sender, instance, **kwargs):
+    remove_post(instance)
+
+
+@receiver(post_init, sender=Group)
+def remember_group_fields(sender, instance, **kwargs):
+    instance._saved_fields = (instance.title, instance.slug)
+
+
+@receiver(post_save, sender=Group)
+def drop_saved_group(sender, instance, created, **kwargs):
+    old_title, old_slug = instance._saved_fields
+    scopes = {f'group:{old_slug}', f'group:{instance.slug}'}
+    if not created and (old_title, old_slug) != (
+            instance.title, instance.slug):
+        invalidate_group_cards(instance.pk)
+        scopes.add('index')
+    bump_scopes(scopes)
+    drop_registry_group(instance.pk, {old_slug, instance.slug})
+    instance._saved_fields = (instance.title, instance.slug)
+
+
+@receiver(post_delete, sender=Group)
+def drop_deleted_group(sender, instance, **kwargs):
+    invalidate_group_cards(instance.pk)
+    drop_registry_group(instance.pk, {instance._saved_fields[1]})
+
+
+def drop_registry_group(pk, slugs):
+    """Сбрасывает группу сразу и ещё раз после коммита: читатели,
+    успевшие до коммита взять старую строку, не оставят её в кэше."""
+    registry.invalidate(pk, slugs)
+    transaction.on_commit(lambda: registry.invalidate(pk, slugs))
+
+
+@receiver(post_init, sender=User)
+def remember_author_fields(sender, instance, **kwargs):
+    if AUTHOR_NAME_FIELDS & instance.get_deferred_fields():
+        instance._author_fields = None
+    else:
+        instance._author_fields = author_fields(instance)
+
+
+@receiver(post_save, sender=User)
+def update_author_fields(sender, instance, created, **kwargs):
+    # Пользователь из кэша восстановлен без post_init и снимка полей.
+    old_fields = getattr(instance, '_author_fields', None)
+    instance._author_fields = author_fields(instance)
+    if created or old_fields == instance._author_fields:
+        return
+    # Все посты автора переписываются вне запроса, сохранившего профиль.
+    sync_user_posts.defer(
+        instance.pk, old_fields[0] if old_fields is not None else None)
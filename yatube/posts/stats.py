@@ -0,0 +1,45 @@
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import AuthorStats, Post, User
+
+
+def author_posts_count(author):
+    """Число постов автора из AuthorStats, без запроса, если stats
+    загружены через select_related."""
+    try:
+        return author.stats.posts_count
+    except AuthorStats.DoesNotExist:
+        return author.posts.count()
+
+
+def change_posts_count(author_id, delta):
+    updated = AuthorStats.objects.filter(
+        user_id=author_id, posts_count__gte=-delta
+    ).update(posts_count=F('posts_count') + delta)
+    if not updated and delta > 0:
+        AuthorStats.objects.get_or_create(
+            user_id=author_id,
+            defaults={
+                'posts_count': Post.objects.filter(author_id=author_id).count()
+            },
+        )
+
+
+def rebuild_author_stats(batch_size=1000):
+    """Пересчитывает AuthorStats всех пользователей. Возвращает их число."""
+    counts = User.objects.annotate(count=Count('posts')).values_list(
+        'pk', 'count').order_by('pk')
+    total = 0
+    with transaction.atomic():
+        AuthorStats.objects.all().delete()
+        batch = []
+        for pk, count in counts.iterator(chunk_size=batch_size):
+            batch.append(AuthorStats(user_id=pk, posts_count=count))
+            if len(batch) == batch_size:
+                AuthorStats.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        AuthorStats.objects.bulk_create(batch)
+        total += len(batch)
+    return total
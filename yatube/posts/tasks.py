@@ -0,0 +1,28 @@
+"""Фоновые задачи постов в очереди core/tasks.py."""
+from core.tasks import task
+
+from .authors import sync_author_fields
+from .cache import author_posts_scope, bump_scopes
+from .groups import registry
+from .models import Post, User
+
+
+@task(name='posts.sync_author_fields')
+def sync_user_posts(user_id, old_username=None):
+    """Переписывает логин и имя пользователя в его постах и сбрасывает
+    страницы, где они видны: главную, профиль, группы с его постами и
+    страницы самих постов."""
+    user = User.objects.filter(pk=user_id).only(
+        'username', 'first_name', 'last_name').first()
+    if user is None or not sync_author_fields(user):
+        return
+    scopes = {'index', f'author:{user.username}', author_posts_scope(user.pk)}
+    if old_username:
+        scopes.add(f'author:{old_username}')
+    group_ids = list(Post.objects.filter(
+        author_id=user.pk, group__isnull=False,
+    ).values_list('group_id', flat=True).distinct())
+    scopes.update(
+        f'group:{group.slug}'
+        for group in registry.get_many(group_ids).values())
+    bump_scopes(scopes)
@@ -0,0 +1,10 @@
+from django import template
+
+from ..utils import page_window as build_page_window
+
+register = template.Library()
+
+
+@register.simple_tag
+def page_window(page_obj, on_each_side=2, on_ends=1):
+    return build_page_window(page_obj, on_each_side, on_ends)
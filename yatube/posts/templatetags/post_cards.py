@@ -0,0 +1,10 @@
+from django import template
+
+from ..cache import render_post_card
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card(post, show_author_link=False, show_group_link=False):
+    return render_post_card(post, show_author_link, show_group_link)
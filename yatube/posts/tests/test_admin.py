@@ -0,0 +1,84 @@
+import datetime
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Group, Post, User
+
+
+class PostAdminTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password')
+        cls.groups = Group.objects.bulk_create([
+            Group(title=f'Группа {index}', slug=f'group-{index}')
+            for index in range(50)
+        ])
+        Post.objects.bulk_create([
+            Post(author=cls.admin, text=f'Пост {index}', group=cls.groups[0])
+            for index in range(30)
+        ])
+        first, second, third = Post.objects.order_by('pk')[:3]
+        Post.objects.filter(pk__in=(first.pk, second.pk)).update(
+            pub_date=timezone.make_aware(datetime.datetime(2019, 3, 5, 23)))
+        Post.objects.filter(pk=third.pk).update(
+            pub_date=timezone.make_aware(datetime.datetime(2021, 7, 1, 1)))
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        self.url = reverse('admin:posts_post_changelist')
+
+    def test_changelist_renders_only_selected_groups(self):
+        """Строки списка не перечисляют все группы в <select>."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'Группа 49')
+        self.assertContains(response, 'admin-autocomplete')
+
+    def test_changelist_skips_full_count(self):
+        """Без фильтров нет COUNT(*) по posts_post."""
+        response = self.client.get(self.url)
+        latest_pk = Post.objects.order_by('-pk').values_list(
+            'pk', flat=True)[0]
+        self.assertEqual(response.context['cl'].result_count, latest_pk)
+        self.assertIsNone(response.context['cl'].full_result_count)
+
+    def test_date_hierarchy(self):
+        """Иерархия дат строится поиском по индексу и фильтрует список."""
+        response = self.client.get(self.url)
+        self.assertContains(response, '?pub_date__year=2019')
+        self.assertContains(response, '?pub_date__year=2021')
+        response = self.client.get(self.url, {'pub_date__year': 2019})
+        self.assertEqual(response.context['cl'].result_count, 2)
+        self.assertContains(response, 'pub_date__month=3')
+        response = self.client.get(
+            self.url, {'pub_date__year': 2019, 'pub_date__month': 3})
+        self.assertContains(response, 'pub_date__day=5')
+
+    def test_search_without_words(self):
+        """Поиск из одних знаков препинания находит пустой список."""
+        for term in ('!!!', '"'):
+            with self.subTest(term=term):
+                response = self.client.get(self.url, {'q': term})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(list(response.context['cl'].result_list), [])
+
+    def test_group_autocomplete_by_prefix(self):
+        """Автодополнение групп ищет по началу названия."""
+        response = self.client.get(
+            reverse('admin:posts_group_autocomplete'), {'term': 'Группа 4'})
+        texts = {item['text'] for item in response.json()['results']}
+        expected = {f'Группа {index}' for index in (4, *range(40, 50))}
+        self.assertEqual(texts, expected)
+
+    def test_group_changelist_search_unchanged(self):
+        """Поиск в списке групп ищет подстроку, а не префикс."""
+        response = self.client.get(
+            reverse('admin:posts_group_changelist'), {'q': 'уппа'})
+        self.assertEqual(response.context['cl'].result_count, 50)
+        response = self.client.get(
+            reverse('admin:posts_group_autocomplete'), {'term': 'уппа'})
+        self.assertEqual(response.json()['results'], [])
@@ -0,0 +1,141 @@
+import json
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import TestCase
+from django.urls import reverse
+
+from ..groups import registry
+from ..models import Group, Post, User
+
+
+class PostApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.other = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create([
+            Post(author=cls.user, text=f'Пост {index}', group=cls.group)
+            for index in range(25)
+        ])
+        cls.other_post = Post.objects.create(
+            author=cls.other, text='Чужой пост')
+
+    def setUp(self):
+        cache.clear()
+
+    def get_json(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        if response.streaming:
+            return response, json.loads(b''.join(response.streaming_content))
+        return response, json.loads(response.content)
+
+    def walk(self, url, **params):
+        """Все посты списка, по страницам через next."""
+        items = []
+        while url:
+            _, data = self.get_json(url, **params)
+            items += data['results']
+            url, params = data['next'], {}
+        return items
+
+    def test_list_pages_by_cursor(self):
+        """Список отдаётся потоком и листается курсором без повторов."""
+        response, data = self.get_json(reverse('posts:api_posts'))
+        self.assertTrue(response.streaming)
+        self.assertEqual(len(data['results']), 20)
+        items = self.walk(reverse('posts:api_posts'), limit=7)
+        expected = list(Post.objects.order_by(
+            '-pub_date', '-pk').values_list('pk', flat=True))
+        self.assertEqual([item['id'] for item in items], expected)
+
+    def test_list_item_fields(self):
+        """Пост сериализуется со слагом группы и именем автора."""
+        _, data = self.get_json(reverse('posts:api_posts'), limit=1)
+        post = Post.objects.order_by('-pub_date', '-pk').first()
+        self.assertEqual(data['results'][0], {
+            'id': post.pk,
+            'text': post.text,
+            'pub_date': DjangoJSONEncoder().default(post.pub_date),
+            'author': post.author.username,
+            'group': None if post.group_id is None else 'test-slug',
+        })
+
+    def test_sparse_fields(self):
+        """?fields= оставляет только перечисленные поля."""
+        _, data = self.get_json(
+            reverse('posts:api_posts'), fields='id,text', limit=3)
+        for item in data['results']:
+            self.assertEqual(set(item), {'id', 'text'})
+        _, data = self.get_json(
+            reverse('posts:api_post_detail', args=(self.other_post.pk,)),
+            fields='author')
+        self.assertEqual(data, {'author': 'other'})
+
+    def test_group_and_author_lists(self):
+        """Списки группы и автора содержат только их посты."""
+        items = self.walk(
+            reverse('posts:api_group_posts', args=('test-slug',)),
+            fields='group')
+        self.assertEqual(len(items), 25)
+        self.assertEqual({item['group'] for item in items}, {'test-slug'})
+        items = self.walk(
+            reverse('posts:api_author_posts', args=('other',)))
+        self.assertEqual(
+            [item['id'] for item in items], [self.other_post.pk])
+
+    def test_list_queries(self):
+        """Страница списка читается одним запросом."""
+        with self.assertNumQueries(1):
+            self.get_json(reverse('posts:api_posts'), fields='id,author')
+
+    def test_groups_loaded_once_per_chunk(self):
+        """Группы страницы с холодным реестром - один запрос на пачку."""
+        groups = [
+            Group.objects.create(
+                title=f'Группа {index}', slug=f'group-{index}')
+            for index in range(5)
+        ]
+        Post.objects.bulk_create([
+            Post(author=self.user, text=str(index), group=group)
+            for index, group in enumerate(groups * 2)
+        ])
+        registry.clear()
+        with self.settings(API_CHUNK_SIZE=100):
+            with self.assertNumQueries(2):
+                _, data = self.get_json(
+                    reverse('posts:api_posts'), fields='group', limit=37)
+        self.assertEqual(
+            {item['group'] for item in data['results']},
+            {'test-slug', None, *(group.slug for group in groups)})
+
+    def test_errors(self):
+        """Неверные параметры дают 400, отсутствующие объекты - 404."""
+        bad = (
+            {'fields': 'id,password'},
+            {'limit': 'много'},
+            {'limit': '0'},
+            {'after': 'испорчен'},
+        )
+        for params in bad:
+            with self.subTest(params=params):
+                response, data = self.get_json(
+                    reverse('posts:api_posts'), **params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', data)
+        missing = (
+            reverse('posts:api_post_detail', args=(0,)),
+            reverse('posts:api_group_posts', args=('missing',)),
+            reverse('posts:api_author_posts', args=('missing',)),
+        )
+        for url in missing:
+            with self.subTest(url=url):
+                response, _ = self.get_json(url)
+                self.assertEqual(response.status_code, 404)
@@ -0,0 +1,125 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Group, Post, User
+from core.models import Task
+from core.tasks import run_batch
+
+
+class AuthorFieldsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='auth', first_name='Лев', last_name='Толстой')
+        cls.post = Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_fields_filled_on_save(self):
+        """Новый пост получает логин и имя автора."""
+        self.assertEqual(self.post.author_username, 'auth')
+        self.assertEqual(self.post.author_full_name, 'Лев Толстой')
+
+    def test_bulk_create_loads_authors_once(self):
+        """bulk_create выбирает авторов одним запросом на пачку."""
+        other = User.objects.create_user(username='other')
+        with self.assertNumQueries(2):
+            Post.objects.bulk_create([
+                Post(author_id=author.pk, text=str(index))
+                for index, author in enumerate((self.user, other) * 5)
+            ])
+        self.assertEqual(
+            set(Post.objects.values_list('author_username', flat=True)),
+            {'auth', 'other'})
+
+    def test_rename_updates_posts_and_cards(self):
+        """Смена имени переписывает посты и карточки лент."""
+        self.client.get(reverse('posts:index'))
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = 'Николай'
+        user.save()
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.author_full_name, 'Николай Толстой')
+        self.assertContains(
+            self.client.get(reverse('posts:index')), 'Николай Толстой')
+
+    def test_rename_changes_group_and_post_pages(self):
+        """Смена имени меняет ETag страниц групп автора и его постов."""
+        group = Group.objects.create(title='Группа', slug='group')
+        post = Post.objects.create(
+            author=self.user, text='Пост в группе', group=group)
+        urls = (
+            reverse('posts:group_list', args=('group',)),
+            reverse('posts:post_detail', args=(self.post.pk,)),
+            reverse('posts:post_detail', args=(post.pk,)),
+        )
+        etags = {url: self.client.get(url)['ETag'] for url in urls}
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = 'Николай'
+        user.save()
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+                self.assertContains(response, 'Николай Толстой')
+
+    @override_settings(TASKS_EAGER=False)
+    def test_rename_queues_post_update(self):
+        """Сохранение профиля не переписывает посты само, а ставит
+        задачу в очередь."""
+        user = User.objects.get(pk=self.user.pk)
+        user.username = 'tolstoy'
+        user.save()
+        self.assertEqual(
+            Post.objects.get(pk=self.post.pk).author_username, 'auth')
+        self.assertEqual(Task.objects.get().name, 'posts.sync_author_fields')
+        run_batch()
+        self.assertEqual(
+            Post.objects.get(pk=self.post.pk).author_username, 'tolstoy')
+        self.assertFalse(Task.objects.exists())
+
+    def test_login_does_not_touch_posts(self):
+        """Сохранение пользователя без смены имени не трогает посты."""
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(1):
+            user.save(update_fields=['last_login'])
+
+    def test_repair_command(self):
+        """repair_author_fields чинит поля, изменённые в обход ORM."""
+        Post.objects.update(author_username='', author_full_name='')
+        User.objects.filter(pk=self.user.pk).update(last_name='Н.')
+        out = StringIO()
+        call_command('repair_author_fields', stdout=out)
+        self.assertIn('1', out.getvalue())
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(
+            (post.author_username, post.author_full_name), ('auth', 'Лев Н.'))
+
+    def test_feeds_skip_user_table(self):
+        """Ленты не соединяют посты с auth_user."""
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:index_rss'),
+            reverse('posts:api_posts'),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                cache.clear()
+                with CaptureQueriesContext(connection) as context:
+                    response = self.client.get(url)
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                post_queries = [
+                    query['sql'] for query in context.captured_queries
+                    if 'FROM "posts_post"' in query['sql']
+                    and 'MAX(' not in query['sql']]
+                self.assertTrue(post_queries)
+                for sql in post_queries:
+                    self.assertNotIn('auth_user', sql)
@@ -0,0 +1,165 @@
+import hashlib
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..cache import CARD_TEMPLATE, bump_feed_generations, page_cache
+from ..models import Group, Post, User
+
+
+class PostCardCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='75',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Тестовый пост',
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_card_rendered_once(self):
+        """Повторный показ ленты не отрисовывает карточку заново."""
+        response = self.client.get(reverse('posts:index'))
+        self.assertTemplateUsed(response, CARD_TEMPLATE)
+        response = self.client.get(reverse('posts:index'))
+        self.assertTemplateNotUsed(response, CARD_TEMPLATE)
+        self.assertContains(response, self.post.text)
+
+    def test_post_edit_invalidates_card(self):
+        """Редактирование поста сбрасывает его карточку."""
+        self.client.get(reverse('posts:index'))
+        self.authorized_client.post(
+            reverse('posts:post_edit', args=(self.post.id,)),
+            data={'text': 'Новый текст', 'group': self.group.id},
+        )
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, 'Новый текст')
+        self.assertNotContains(response, self.post.text)
+
+    def test_group_change_invalidates_cards(self):
+        """Смена названия группы и удаление группы сбрасывают карточки."""
+        self.client.get(reverse('posts:index'))
+        group = Group.objects.get(pk=self.group.pk)
+        group.title = 'Новое название'
+        group.save()
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, 'Новое название')
+        group.delete()
+        response = self.client.get(reverse('posts:index'))
+        self.assertNotContains(response, 'Новое название')
+
+
+@override_settings(PAGE_CACHE=True)
+class AnonymousPageCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.other = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='75',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Тестовый пост',
+            group=cls.group,
+        )
+        cls.other_post = Post.objects.create(
+            author=cls.other,
+            text='Чужой пост',
+            group=cls.other_group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.pages = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.user.username,)),
+            reverse('posts:post_detail', args=(self.post.id,)),
+        )
+        self.other_pages = (
+            reverse('posts:group_list', args=(self.other_group.slug,)),
+            reverse('posts:profile', args=(self.other.username,)),
+            reverse('posts:post_detail', args=(self.other_post.id,)),
+        )
+
+    def warm(self, urls):
+        for url in urls:
+            self.client.get(url)
+
+    def test_anonymous_hit_skips_database(self):
+        """Повторный запрос анонима обслуживается из кэша без запросов."""
+        self.warm(self.pages)
+        for url in self.pages:
+            with self.subTest(url=url):
+                with self.assertNumQueries(0):
+                    response = self.client.get(url)
+                self.assertContains(response, self.post.text)
+
+    def test_authorized_user_bypasses_cache(self):
+        """Авторизованный пользователь получает свежую страницу."""
+        self.warm(self.pages)
+        response = self.authorized_client.get(self.pages[0])
+        self.assertIn('page_obj', response.context)
+
+    def test_new_post_invalidates_only_its_pages(self):
+        """Новый пост сбрасывает главную, страницы своей группы и автора."""
+        self.warm(self.pages + self.other_pages)
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            data={'text': 'Свежий пост', 'group': self.group.id},
+        )
+        for url in self.pages[:3]:
+            with self.subTest(url=url):
+                self.assertContains(self.client.get(url), 'Свежий пост')
+        for url in self.other_pages:
+            with self.subTest(url=url):
+                with self.assertNumQueries(0):
+                    self.client.get(url)
+
+    def test_post_edit_invalidates_old_group(self):
+        """Перенос поста в другую группу сбрасывает обе группы."""
+        self.warm(self.pages + self.other_pages)
+        self.authorized_client.post(
+            reverse('posts:post_edit', args=(self.post.id,)),
+            data={'text': 'Перенесённый пост', 'group': self.other_group.id},
+        )
+        response = self.client.get(self.pages[1])
+        self.assertNotContains(response, 'Перенесённый пост')
+        response = self.client.get(self.other_pages[0])
+        self.assertContains(response, 'Перенесённый пост')
+
+    def test_stale_copy_served_while_regenerating(self):
+        """Пока другой процесс пересобирает страницу, отдаётся старая."""
+        url = self.pages[0]
+        self.warm((url,))
+        bump_feed_generations(self.post)
+        page_key = f'page:{hashlib.md5(url.encode()).hexdigest()}'
+        page_cache().add(f'{page_key}:lock', True)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertContains(response, self.post.text)
+        page_cache().delete(f'{page_key}:lock')
+        self.assertIn('page_obj', self.client.get(url).context)
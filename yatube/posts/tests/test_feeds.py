@@ -0,0 +1,161 @@
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post, User
+
+
+class FeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text='Тестовый пост', group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_feeds_list_posts(self):
+        """RSS и Atom ленты главной, группы и автора содержат посты."""
+        feeds = {
+            reverse('posts:index_rss'): 'application/rss+xml',
+            reverse('posts:index_atom'): 'application/atom+xml',
+            reverse('posts:group_rss', args=('test-slug',)):
+                'application/rss+xml',
+            reverse('posts:group_atom', args=('test-slug',)):
+                'application/atom+xml',
+            reverse('posts:profile_rss', args=('auth',)):
+                'application/rss+xml',
+            reverse('posts:profile_atom', args=('auth',)):
+                'application/atom+xml',
+        }
+        for url, content_type in feeds.items():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertTrue(
+                    response['Content-Type'].startswith(content_type))
+                self.assertContains(response, 'Тестовый пост')
+                self.assertTrue(response.has_header('ETag'))
+                self.assertTrue(response.has_header('Last-Modified'))
+
+    def test_unknown_feed_returns_404(self):
+        """Лента несуществующей группы или автора отвечает 404."""
+        for url in (
+            reverse('posts:group_rss', args=('missing',)),
+            reverse('posts:profile_atom', args=('missing',)),
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_unchanged_feeds_return_304(self):
+        """Повторный запрос с валидаторами получает 304 Not Modified."""
+        urls = (
+            reverse('posts:index_rss'),
+            reverse('posts:group_atom', args=('test-slug',)),
+            reverse('posts:index'),
+            reverse('posts:group_list', args=('test-slug',)),
+            reverse('posts:profile', args=('auth',)),
+            reverse('posts:post_detail', args=(self.post.pk,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                etag = response['ETag']
+                last_modified = response['Last-Modified']
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+                response = self.client.get(
+                    url, HTTP_IF_MODIFIED_SINCE=last_modified)
+                self.assertEqual(response.status_code, 304)
+
+    def test_new_post_changes_validators(self):
+        """Новый пост меняет ETag главной и ленты своей группы."""
+        url = reverse('posts:group_rss', args=('test-slug',))
+        etag = self.client.get(url)['ETag']
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            data={'text': 'Свежий пост', 'group': self.group.id},
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Свежий пост')
+
+    def test_orm_edit_and_delete_change_validators(self):
+        """Правка, перенос из группы и удаление не самого свежего поста
+        в обход view меняют ETag его страниц."""
+        old = Post.objects.create(
+            author=self.user, text='Старый пост', group=self.group)
+        Post.objects.filter(pk=old.pk).update(
+            pub_date=self.post.pub_date.replace(year=2000))
+        Post.objects.create(author=self.user, text='Новый пост')
+        old = Post.objects.get(pk=old.pk)
+        index = reverse('posts:index')
+        group = reverse('posts:group_list', args=('test-slug',))
+        changes = (
+            (self.edit, (index, group)),
+            (self.move, (index, group)),
+            (Post.delete, (index,)),
+        )
+        for change, urls in changes:
+            etags = {url: self.client.get(url)['ETag'] for url in urls}
+            change(old)
+            for url in urls:
+                with self.subTest(change=change.__name__, url=url):
+                    response = self.client.get(
+                        url, HTTP_IF_NONE_MATCH=etags[url])
+                    self.assertEqual(response.status_code, 200)
+
+    @override_settings(PAGE_CACHE=True)
+    def test_author_posts_count_changes_post_pages(self):
+        """Удаление и создание другого поста автора меняют ETag и копию
+        страницы поста: на ней показано число постов автора."""
+        url = reverse('posts:post_detail', args=(self.post.pk,))
+        old = Post.objects.create(author=self.user, text='Старый пост')
+        Post.objects.filter(pk=old.pk).update(
+            pub_date=self.post.pub_date.replace(year=2000))
+        changes = (
+            (old.delete, 1),
+            (lambda: Post.objects.create(author=self.user, text='Ещё'), 2),
+        )
+        for change, count in changes:
+            etag = self.client.get(url)['ETag']
+            change()
+            with self.subTest(count=count):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(
+                    response, f'Всего постов автора:  <span >{count}</span>')
+
+    @staticmethod
+    def edit(post):
+        post.text = 'Исправленный пост'
+        post.save()
+
+    @staticmethod
+    def move(post):
+        post.group = None
+        post.save()
+
+    def test_authorized_pages_compare_etag_only(self):
+        """Для авторизованных ETag свой, а Last-Modified не отдаётся."""
+        url = reverse('posts:index')
+        anonymous = self.client.get(url)
+        response = self.authorized_client.get(
+            url, HTTP_IF_NONE_MATCH=anonymous['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Last-Modified'))
+        response = self.authorized_client.get(
+            url, HTTP_IF_MODIFIED_SINCE=anonymous['Last-Modified'])
+        self.assertEqual(response.status_code, 200)
+        response = self.authorized_client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
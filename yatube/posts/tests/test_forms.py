@@ -100,3 +100,58 @@ class PostCreateFormTests(TestCase):
         )
         self.assertEqual(response.status_code, HTTPStatus.OK)
         self.assertEqual(Post.objects.count(), posts_count)
+
+
+class GroupPickerTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.groups = Group.objects.bulk_create(
+            Group(title=f'Группа {index}', slug=f'group-{index}',
+                  description='Описание') for index in range(30)
+        )
+        cls.group = Group.objects.get(slug='group-7')
+        cls.post = Post.objects.create(
+            author=cls.user, text='Текст', group=cls.group)
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_form_renders_only_selected_group(self):
+        """В select выводится только выбранная группа."""
+        response = self.authorized_client.get(
+            reverse('posts:post_edit', args=(self.post.id,)))
+        self.assertContains(response, '<option value=', count=2)
+        self.assertContains(
+            response, f'<option value="{self.group.pk}" selected>')
+        self.assertContains(
+            response, reverse('posts:group_autocomplete'))
+        self.assertContains(response, 'js/group_autocomplete.js')
+
+    def test_group_validated_by_single_lookup(self):
+        """Проверка группы - один запрос по pk."""
+        form = PostForm(data={'text': 'Текст', 'group': self.group.pk})
+        with self.assertNumQueries(1):
+            self.assertTrue(form.is_valid())
+        form = PostForm(data={'text': 'Текст', 'group': 10**6})
+        self.assertFalse(form.is_valid())
+
+    def test_autocomplete(self):
+        """Автодополнение ищет по префиксу названия и слага с лимитом."""
+        url = reverse('posts:group_autocomplete')
+        with self.settings(GROUP_AUTOCOMPLETE_LIMIT=5):
+            results = self.client.get(url, {'q': 'Группа'}).json()['results']
+        self.assertEqual(len(results), 5)
+        results = self.client.get(url, {'q': 'Группа 2'}).json()['results']
+        self.assertEqual(
+            sorted(group['slug'] for group in results),
+            ['group-2', 'group-20', 'group-21', 'group-22', 'group-23',
+             'group-24', 'group-25', 'group-26', 'group-27', 'group-28',
+             'group-29'])
+        results = self.client.get(url, {'q': 'GROUP-7'}).json()['results']
+        self.assertEqual(
+            results, [{'id': self.group.pk, 'text': 'Группа 7',
+                       'slug': 'group-7'}])
+        self.assertEqual(self.client.get(url).json(), {'results': []})
@@ -0,0 +1,81 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..groups import registry
+from ..models import Group, Post, User
+
+
+class GroupRegistryTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.create(
+            author=cls.user, text='Тестовый пост', group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        registry.clear()
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+
+    def test_repeated_lookups_skip_database(self):
+        """Группа берётся из реестра без запросов к базе."""
+        registry.get_by_slug('test-slug')
+        with self.assertNumQueries(0):
+            self.assertEqual(registry.get_by_slug('test-slug'), self.group)
+            self.assertEqual(registry.get(self.group.pk), self.group)
+
+    def test_shared_cache_fills_local_copy(self):
+        """После сброса локальной копии группа читается из общего кэша."""
+        registry.get_by_slug('test-slug')
+        registry.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(registry.get_by_slug('test-slug'), self.group)
+
+    def test_index_reads_groups_from_registry(self):
+        """Главная страница не соединяет посты с таблицей групп."""
+        response = self.client.get(reverse('posts:index'))
+        self.assertEqual(
+            response.context['page_obj'][0].group.title, self.group.title)
+        self.assertIs(
+            response.context['page_obj'][0].group,
+            registry.get(self.group.pk))
+
+    def test_admin_slug_edit_invalidates_registry(self):
+        """Правка slug в списке админки сразу меняет адрес группы."""
+        old_url = reverse('posts:group_list', args=('test-slug',))
+        self.assertEqual(self.client.get(old_url).status_code, 200)
+        response = self.admin_client.post(
+            reverse('admin:posts_group_changelist'),
+            {
+                'form-TOTAL_FORMS': '1',
+                'form-INITIAL_FORMS': '1',
+                'form-MIN_NUM_FORMS': '0',
+                'form-MAX_NUM_FORMS': '1000',
+                'form-0-id': str(self.group.pk),
+                'form-0-slug': 'new-slug',
+                '_save': 'Сохранить',
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.client.get(old_url).status_code, 404)
+        response = self.client.get(
+            reverse('posts:group_list', args=('new-slug',)))
+        self.assertEqual(response.context['group'].slug, 'new-slug')
+
+    def test_delete_invalidates_registry(self):
+        """Удалённая группа пропадает из реестра."""
+        group = Group.objects.create(title='Удаляемая', slug='gone')
+        registry.get_by_slug('gone')
+        Group.objects.get(pk=group.pk).delete()
+        self.assertIsNone(registry.get_by_slug('gone'))
+        self.assertIsNone(registry.get(group.pk))
@@ -0,0 +1,61 @@
+import re
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Group, Post, User
+
+FULL_SCAN = re.compile(r'\bSCAN (TABLE )?posts_post\b(?! USING)')
+TEMP_SORT = 'USE TEMP B-TREE'
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN - SQLite')
+class PostQueryPlanTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='75',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            [Post(author=cls.user, text=f'{index}', group=cls.group)
+             for index in range(15)]
+        )
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+
+    def feed_queries(self, url):
+        """SQL-запросы к posts_post, выполненные при открытии страницы."""
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url)
+        return [query['sql'] for query in context.captured_queries
+                if 'posts_post' in query['sql']]
+
+    def test_feeds_use_indexes(self):
+        """Ленты не сканируют всю таблицу и не сортируют во временном
+        B-дереве."""
+        feeds = (
+            ('posts:index', None),
+            ('posts:group_list', (self.group.slug,)),
+            ('posts:profile', (self.user.username,)),
+        )
+        pages = ('', '?page=2', '?after=')
+        for name, args in feeds:
+            for page in pages:
+                url = reverse(name, args=args) + page
+                queries = self.feed_queries(url)
+                self.assertTrue(queries, url)
+                for sql in queries:
+                    for detail in self.explain(sql):
+                        with self.subTest(url=url, detail=detail):
+                            self.assertIsNone(FULL_SCAN.search(detail), sql)
+                            self.assertNotIn(TEMP_SORT, detail, sql)
@@ -0,0 +1,78 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Group, Post, User
+
+
+@skipUnless(connection.vendor == 'sqlite', 'FTS5 - SQLite')
+class PostSearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.other = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='75',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Котики <b>правят</b> миром, котики котики',
+            group=cls.group,
+        )
+        cls.other_post = Post.objects.create(
+            author=cls.other,
+            text='Собаки и котики дружат',
+        )
+        Post.objects.create(author=cls.other, text='Про погоду')
+
+    def search(self, **params):
+        response = self.client.get(reverse('posts:search'), params)
+        return response, list(response.context['page_obj'])
+
+    def test_ranked_results_with_snippet(self):
+        """Поиск находит посты по словам, сортирует по рангу
+        и подсвечивает совпадения, экранируя текст."""
+        response, posts = self.search(q='котики')
+        self.assertEqual(posts, [self.post, self.other_post])
+        self.assertContains(response, '<mark>Котики</mark>')
+        self.assertContains(response, '&lt;b&gt;правят&lt;/b&gt;')
+
+    def test_prefix_and_filters(self):
+        """Последнее слово ищется по префиксу, работают фильтры."""
+        _, posts = self.search(q='кот')
+        self.assertEqual(len(posts), 2)
+        _, posts = self.search(q='котики', group=self.group.slug)
+        self.assertEqual(posts, [self.post])
+        _, posts = self.search(q='котики', author=self.other.username)
+        self.assertEqual(posts, [self.other_post])
+        _, posts = self.search(q='"котики OR')
+        self.assertEqual(posts, [])
+
+    def test_index_follows_changes(self):
+        """Индекс обновляется при изменении и удалении постов."""
+        Post.objects.filter(pk=self.other_post.pk).update(text='Про ежей')
+        _, posts = self.search(q='ежей')
+        self.assertEqual(posts, [self.other_post])
+        _, posts = self.search(q='котики')
+        self.assertEqual(posts, [self.post])
+        Post.objects.get(pk=self.post.pk).delete()
+        _, posts = self.search(q='котики')
+        self.assertEqual(posts, [])
+
+    def test_admin_search_uses_index(self):
+        """Поиск в админке идёт через FTS5."""
+        admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin')
+        client = Client()
+        client.force_login(admin)
+        response = client.get(
+            reverse('admin:posts_post_changelist'), {'q': 'собаки'})
+        self.assertEqual(
+            list(response.context['cl'].result_list), [self.other_post])
+        self.assertIn(
+            'posts_post_fts MATCH', str(response.context['cl'].queryset.query))
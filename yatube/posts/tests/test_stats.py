@@ -0,0 +1,48 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import AuthorStats, Post, User
+
+
+class AuthorStatsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.post = Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def test_signals_maintain_posts_count(self):
+        """Создание и удаление постов обновляют posts_count."""
+        self.assertEqual(self.user.stats.posts_count, 1)
+        post = Post.objects.create(author=self.user, text='Ещё пост')
+        self.user.stats.refresh_from_db()
+        self.assertEqual(self.user.stats.posts_count, 2)
+        post.delete()
+        self.user.stats.refresh_from_db()
+        self.assertEqual(self.user.stats.posts_count, 1)
+
+    def test_rebuild_command(self):
+        """rebuild_author_stats пересчитывает посты, созданные bulk_create."""
+        Post.objects.bulk_create(
+            [Post(author=self.user, text=f'{index}') for index in range(3)])
+        call_command('rebuild_author_stats', stdout=StringIO())
+        self.assertEqual(
+            AuthorStats.objects.get(user=self.user).posts_count, 4)
+
+    def test_post_detail_single_query(self):
+        """post_detail выполняет один запрос и показывает число постов."""
+        self.client.get(reverse('posts:post_detail', args=(self.post.id,)))
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse('posts:post_detail', args=(self.post.id,)))
+        self.assertEqual(response.context['posts_count'], 1)
+
+    def test_profile_count(self):
+        """profile берёт число постов из AuthorStats без COUNT(*)."""
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse('posts:profile', args=(self.user.username,)))
+        self.assertEqual(response.context['count'], 1)
@@ -0,0 +1,117 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post, User
+from ..timelines import timeline_cache, timeline_key
+
+
+@override_settings(TIMELINES=True, TIMELINE_SIZE=15)
+class TimelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='75',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other',
+            description='Тестовое описание',
+        )
+        for index in range(20):
+            Post.objects.create(
+                author=cls.user, text=f'{index}', group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.group_url = reverse('posts:group_list', args=(self.group.slug,))
+
+    def feed(self, url):
+        posts, page = [], 1
+        while True:
+            page_obj = self.client.get(url, {'page': page}).context['page_obj']
+            posts += page_obj
+            if not page_obj.has_next():
+                return posts
+            page += 1
+
+    def test_pages_match_database_order(self):
+        """Страницы, включая лежащие за пределами ленты, совпадают
+        с упорядоченным запросом."""
+        expected = list(Post.objects.order_by('-pub_date', '-pk'))
+        self.assertEqual(self.feed(self.group_url), expected)
+        self.assertEqual(
+            self.feed(reverse('posts:profile', args=(self.user.username,))),
+            expected)
+
+    @override_settings(TIMELINE_SIZE=50)
+    def test_materialized_page_uses_in_bulk(self):
+        """Неполная лента читается без COUNT(*) и ORDER BY."""
+        self.client.get(self.group_url)
+        with self.assertNumQueries(1):
+            self.client.get(self.group_url)
+
+    def test_create_edit_delete_update_timelines(self):
+        """Новые, перенесённые и удалённые посты отражаются в лентах."""
+        self.client.get(self.group_url)
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            data={'text': 'Свежий пост', 'group': self.group.id},
+        )
+        post = Post.objects.get(text='Свежий пост')
+        ids, truncated = timeline_cache().get(
+            timeline_key('group', self.group.pk))
+        self.assertTrue(truncated)
+        self.assertEqual(ids[0], post.pk)
+        self.assertEqual(len(ids), 15)
+        self.authorized_client.post(
+            reverse('posts:post_edit', args=(post.id,)),
+            data={'text': 'Свежий пост', 'group': self.other_group.id},
+        )
+        self.assertNotIn(post, self.feed(self.group_url))
+        other_url = reverse('posts:group_list', args=(self.other_group.slug,))
+        self.assertEqual(self.feed(other_url), [post])
+        Post.objects.get(pk=post.pk).delete()
+        self.assertEqual(self.feed(other_url), [])
+
+    def test_orm_create_and_move_update_timelines(self):
+        """Пост, созданный и перенесённый в обход view, тоже попадает в
+        ленты."""
+        other_url = reverse('posts:group_list', args=(self.other_group.slug,))
+        self.client.get(self.group_url)
+        self.client.get(other_url)
+        post = Post.objects.create(
+            author=self.user, text='Из админки', group=self.group)
+        self.assertEqual(self.feed(self.group_url)[0], post)
+        post.group = self.other_group
+        post.save()
+        self.assertNotIn(post, self.feed(self.group_url))
+        self.assertEqual(self.feed(other_url), [post])
+
+    def test_delete_keeps_older_posts(self):
+        """После удаления из полной ленты старые посты не пропадают."""
+        self.client.get(self.group_url)
+        Post.objects.order_by('-pub_date', '-pk').first().delete()
+        expected = list(Post.objects.order_by('-pub_date', '-pk'))
+        self.assertEqual(len(expected), 19)
+        self.assertEqual(self.feed(self.group_url), expected)
+        page_obj = self.client.get(self.group_url).context['page_obj']
+        self.assertEqual(page_obj.paginator.count, 19)
+
+    def test_rebuild_command(self):
+        """rebuild_timelines собирает ленты групп и авторов."""
+        call_command('rebuild_timelines', stdout=StringIO())
+        ids, _ = timeline_cache().get(timeline_key('author', self.user.pk))
+        self.assertEqual(
+            ids.tolist(),
+            list(Post.objects.order_by('-pub_date', '-pk').values_list(
+                'pk', flat=True)[:15]))
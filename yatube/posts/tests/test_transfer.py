@@ -0,0 +1,114 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..models import AuthorStats, Group, Post, User
+
+
+class PostTransferTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='75',
+            description='Тестовое описание',
+        )
+        Post.objects.create(author=cls.user, text='Первый', group=cls.group)
+        Post.objects.create(author=cls.user, text='Второй, "с кавычками"')
+
+    def round_trip(self, extension):
+        expected = list(Post.objects.order_by('pk').values_list(
+            'text', 'pub_date', 'author', 'group'))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, f'posts.{extension}')
+            call_command('export_posts', path)
+            Post.objects.all().delete()
+            call_command(
+                'import_posts', path, batch_size=1, stdout=StringIO())
+        imported = list(Post.objects.order_by('pk').values_list(
+            'text', 'pub_date', 'author', 'group'))
+        self.assertEqual(imported, expected)
+        self.assertEqual(
+            AuthorStats.objects.get(user=self.user).posts_count, 2)
+
+    def test_jsonl_round_trip(self):
+        """Выгрузка и загрузка JSON Lines сохраняют посты и даты."""
+        self.round_trip('jsonl')
+
+    def test_csv_round_trip(self):
+        """Выгрузка и загрузка CSV сохраняют посты и даты."""
+        self.round_trip('csv')
+
+    def test_unknown_author_skipped(self):
+        """Строки с неизвестным автором пропускаются."""
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl') as file:
+            file.write('{"text": "x", "author": "nobody"}\n')
+            file.write('{"text": "y", "author": "auth", "group": "none"}\n')
+            file.flush()
+            out = StringIO()
+            call_command('import_posts', file.name, stdout=out)
+        self.assertIn(
+            'Пропущено строк с неизвестным автором: 1', out.getvalue())
+        post = Post.objects.get(text='y')
+        self.assertIsNone(post.group)
+
+    def test_invalid_rows_reported(self):
+        """Неверные строки пропускаются с номером записи, остальные
+        загружаются, а счётчик постов автора обновляется."""
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl') as file:
+            file.write('{"text": "a", "author": "auth"}\n')
+            file.write('{"author": "auth"}\n')
+            file.write('{"text": "b", "author": "auth", "pub_date": "x"}\n')
+            file.write('{"text": "c",\n')
+            file.write('{"text": "d", "author": "auth",'
+                       ' "pub_date": "2020-01-02T03:04:05+00:00"}\n')
+            file.flush()
+            out, err = StringIO(), StringIO()
+            call_command(
+                'import_posts', file.name, batch_size=1,
+                stdout=out, stderr=err)
+        self.assertIn('Загружено постов: 2', out.getvalue())
+        self.assertIn('Пропущено неверных строк: 3', out.getvalue())
+        for number in (2, 3, 4):
+            self.assertIn(f'Запись {number}:', err.getvalue())
+        self.assertEqual(
+            Post.objects.get(text='d').pub_date.isoformat(),
+            '2020-01-02T03:04:05+00:00')
+        self.assertTrue(Post.objects.filter(text='a').exists())
+        self.assertEqual(
+            AuthorStats.objects.get(user=self.user).posts_count, 4)
+
+    def test_import_keeps_auto_now_add(self):
+        """Загрузка с датами не отключает auto_now_add у поля pub_date."""
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl') as file:
+            file.write('{"text": "a", "author": "auth",'
+                       ' "pub_date": "2020-01-02T03:04:05+00:00"}\n')
+            file.flush()
+            call_command('import_posts', file.name, stdout=StringIO())
+        self.assertTrue(Post._meta.get_field('pub_date').auto_now_add)
+        post = Post.objects.create(author=self.user, text='новый')
+        self.assertGreater(post.pub_date.year, 2020)
+
+    def test_batch_queries_do_not_grow_with_rows(self):
+        """Пачка с датами из файла - постоянное число запросов."""
+        for rows in (10, 50):
+            with self.subTest(rows=rows):
+                with tempfile.NamedTemporaryFile(
+                        'w', suffix='.jsonl') as file:
+                    for index in range(rows):
+                        file.write(
+                            f'{{"text": "{index}", "author": "auth", '
+                            f'"group": "75", "pub_date": '
+                            f'"2020-01-02T03:04:{index % 60:02d}+00:00"}}\n')
+                    file.flush()
+                    with self.assertNumQueries(9):
+                        call_command(
+                            'import_posts', file.name, batch_size=rows,
+                            stdout=StringIO())
+        self.assertEqual(
+            Post.objects.filter(pub_date__year=2020).count(), 60)
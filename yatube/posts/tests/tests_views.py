@@ -1,9 +1,12 @@
+from django.core.paginator import Paginator
+from django.template.loader import get_template
 from django.test import Client, TestCase
 from django.urls import reverse
 from django import forms
 
 from ..models import Post, Group, User
 from posts.forms import PostForm
+from posts.utils import page_window
 from yatube.settings import NUMBER_OF_POSTS_IN_PAG
 
 TOTAL_NUMBER_OF_POSTS = 13
@@ -141,3 +144,109 @@ class PaginatorViewsTest(TestCase):
                                                            args=args) + page)
                         self.assertEqual(len(response.context['page_obj']),
                                          number)
+
+
+class CursorPaginatorViewsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='75',
+            description='Тестовое описание',
+        )
+        cls.posts = Post.objects.bulk_create(
+            [Post(author=cls.user,
+                  text=f'{index}',
+                  group=cls.group) for index in range(TOTAL_NUMBER_OF_POSTS)]
+        )
+
+    def walk(self, url):
+        """Проходит ленту по курсорам ?after= до последней страницы."""
+        pages = []
+        response = self.client.get(url + '?after=')
+        while True:
+            page_obj = response.context['page_obj']
+            pages.append(page_obj)
+            if not page_obj.has_next():
+                return pages
+            response = self.client.get(
+                url + f'?after={page_obj.next_cursor}')
+
+    def test_cursor_pages_cover_feed(self):
+        """Курсоры проходят всю ленту в порядке (-pub_date, -id)."""
+        expected = list(Post.objects.order_by('-pub_date', '-pk'))
+        reverse_names = (
+            ('posts:index', None),
+            ('posts:group_list', (self.group.slug,)),
+            ('posts:profile', (self.user.username,)),
+        )
+        for name, args in reverse_names:
+            with self.subTest(name=name):
+                pages = self.walk(reverse(name, args=args))
+                self.assertEqual(
+                    [len(page) for page in pages],
+                    [NUMBER_OF_POSTS_IN_PAG,
+                     TOTAL_NUMBER_OF_POSTS - NUMBER_OF_POSTS_IN_PAG])
+                posts = [post for page in pages for post in page]
+                self.assertEqual(posts, expected)
+                self.assertFalse(pages[0].has_previous())
+                self.assertTrue(pages[1].has_previous())
+
+    def test_cursor_before_returns_previous_page(self):
+        """?before= возвращает предыдущую страницу."""
+        url = reverse('posts:index')
+        first, second = self.walk(url)
+        response = self.client.get(
+            url + f'?before={second.previous_cursor}')
+        page_obj = response.context['page_obj']
+        self.assertEqual(list(page_obj), list(first))
+        self.assertFalse(page_obj.has_previous())
+        self.assertEqual(page_obj.next_cursor, first.next_cursor)
+
+    def test_cursor_page_skips_count(self):
+        """Курсорная страница не выполняет COUNT(*)."""
+        url = reverse('posts:index')
+        first, second = self.walk(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(url + f'?after={first.next_cursor}')
+        self.assertContains(response, f'?before={second.previous_cursor}')
+
+    def test_first_cursor_page_skips_count(self):
+        """Ссылка «Первая» ведёт на курсорную страницу без COUNT(*)."""
+        url = reverse('posts:index')
+        first, second = self.walk(url)
+        response = self.client.get(url + f'?after={first.next_cursor}')
+        self.assertContains(response, 'href="?after="')
+        with self.assertNumQueries(1):
+            response = self.client.get(url + '?after=')
+        self.assertTrue(response.context['page_obj'].is_cursor)
+        self.assertEqual(list(response.context['page_obj']), list(first))
+
+
+class PageWindowTest(TestCase):
+    def window(self, number, posts):
+        return page_window(Paginator(range(posts), 10).get_page(number))
+
+    def test_page_window(self):
+        """Навигация показывает края и окно вокруг текущей страницы."""
+        cases = (
+            (1, 80, [1, 2, 3, 4, 5, 6, 7, 8]),
+            (1, 1000, [1, 2, 3, None, 100]),
+            (50, 1000, [1, None, 48, 49, 50, 51, 52, None, 100]),
+            (100, 1000, [1, None, 98, 99, 100]),
+            (4, 1000, [1, 2, 3, 4, 5, 6, None, 100]),
+        )
+        for number, posts, expected in cases:
+            with self.subTest(number=number, posts=posts):
+                self.assertEqual(self.window(number, posts), expected)
+
+    def test_navigation_size_is_constant(self):
+        """Размер навигации не растёт вместе с числом постов."""
+        template = get_template('posts/includes/paginator.html')
+        sizes = []
+        for posts in (10_000, 1_000_000):
+            page_obj = Paginator(range(posts), 10).get_page(posts // 20)
+            sizes.append(len(template.render({'page_obj': page_obj})))
+        self.assertLess(sizes[1] - sizes[0], 100)
@@ -0,0 +1,139 @@
+"""Материализованные ленты групп и авторов (fan-out on write).
+
+Для каждой группы и автора в кэше хранится список id последних
+TIMELINE_SIZE постов в порядке ленты. Новые и изменённые посты
+дописываются в списки при сохранении, а страница ленты собирается одним
+in_bulk по id вместо упорядоченного запроса ко всей posts_post.
+
+Вместе со списком хранится признак truncated: в ленте были посты
+старше списка. Удаление поста укорачивает список, но не делает его
+полной лентой, поэтому более старые страницы по-прежнему читаются из
+базы. Списки собираются с основной базы, а не с отстающей реплики.
+Записи живут TIMELINE_TIMEOUT секунд: потерянное при гонке добавление
+не останется в кэше навсегда.
+"""
+from array import array
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core.routers import primary_reads
+
+
+def timeline_cache():
+    return caches[settings.TIMELINE_CACHE]
+
+
+def timeline_key(kind, pk):
+    return f'timeline:{kind}:{pk}'
+
+
+def store_timeline(cache, key, ids, truncated):
+    cache.set(key, (ids, truncated), settings.TIMELINE_TIMEOUT)
+
+
+def build_timeline(kind, pk, queryset):
+    with primary_reads():
+        ids = array('q', queryset.order_by('-pub_date', '-pk').values_list(
+            'pk', flat=True)[:settings.TIMELINE_SIZE + 1])
+    truncated = len(ids) > settings.TIMELINE_SIZE
+    del ids[settings.TIMELINE_SIZE:]
+    store_timeline(timeline_cache(), timeline_key(kind, pk), ids, truncated)
+    return ids, truncated
+
+
+def push_post(post):
+    """Добавляет новый пост в начало лент его группы и автора.
+
+    Ленты, которых ещё нет в кэше, не создаются: их соберёт первое
+    чтение или rebuild_timelines.
+    """
+    if not settings.TIMELINES:
+        return
+    cache = timeline_cache()
+    for key, (ids, truncated) in cache.get_many(_post_keys(post)).items():
+        if post.pk not in ids:
+            ids.insert(0, post.pk)
+            truncated = truncated or len(ids) > settings.TIMELINE_SIZE
+            del ids[settings.TIMELINE_SIZE:]
+            store_timeline(cache, key, ids, truncated)
+
+
+def move_post(post, old_group_id):
+    """Переносит отредактированный пост между лентами групп.
+
+    Место поста в новой ленте зависит от дат соседей, поэтому её проще
+    собрать заново при следующем чтении.
+    """
+    if not settings.TIMELINES or old_group_id == post.group_id:
+        return
+    if old_group_id:
+        _drop(timeline_cache(), [timeline_key('group', old_group_id)],
+              post.pk)
+    if post.group_id:
+        forget_timelines('group', [post.group_id])
+
+
+def remove_post(post):
+    if not settings.TIMELINES:
+        return
+    _drop(timeline_cache(), _post_keys(post), post.pk)
+
+
+def forget_timelines(kind, pks):
+    """Удаляет ленты, чтобы они собрались заново при чтении."""
+    timeline_cache().delete_many([timeline_key(kind, pk) for pk in pks])
+
+
+def _post_keys(post):
+    keys = [timeline_key('author', post.author_id)]
+    if post.group_id:
+        keys.append(timeline_key('group', post.group_id))
+    return keys
+
+
+def _drop(cache, keys, post_id):
+    for key, (ids, truncated) in cache.get_many(keys).items():
+        if post_id in ids:
+            ids.remove(post_id)
+            store_timeline(cache, key, ids, truncated)
+
+
+class TimelinePosts:
+    """Лента для Paginator: страницы в пределах списка id собираются
+    через in_bulk, более глубокие читаются из queryset."""
+
+    def __init__(self, ids, truncated, queryset):
+        self.ids = ids
+        self.truncated = truncated
+        self.queryset = queryset
+
+    def count(self):
+        if not self.truncated:
+            return len(self.ids)
+        return self.queryset.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        if index.stop is not None and index.stop > len(self.ids):
+            if self.truncated:
+                return list(
+                    self.queryset.order_by('-pub_date', '-pk')[index])
+        ids = self.ids[index].tolist()
+        posts = self.queryset.in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
+
+
+def timeline(kind, pk, queryset):
+    """Лента группы или автора: TimelinePosts при TIMELINES, иначе
+    исходный queryset."""
+    if not settings.TIMELINES:
+        return queryset
+    entry = timeline_cache().get(timeline_key(kind, pk))
+    if entry is None:
+        entry = build_timeline(kind, pk, queryset)
+    return TimelinePosts(*entry, queryset)
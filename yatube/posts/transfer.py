@@ -0,0 +1,175 @@
+"""Потоковые импорт и экспорт постов в JSON Lines и CSV."""
+import csv
+import json
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .cache import bump_scopes
+from .models import Group, Post, User
+from .stats import change_posts_count
+from .timelines import forget_timelines
+
+FIELDS = ('text', 'pub_date', 'author', 'group')
+
+
+def read_rows(file, fmt):
+    """Генератор словарей с полями FIELDS из открытого файла."""
+    if fmt == 'csv':
+        yield from csv.DictReader(file)
+        return
+    for line in file:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # Отклоняется при проверке строки с номером записи.
+                yield line
+
+
+def write_rows(file, fmt, rows):
+    if fmt == 'csv':
+        writer = csv.writer(file)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+        return
+    for row in rows:
+        file.write(json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False))
+        file.write('\n')
+
+
+def export_rows(chunk_size=2000):
+    """Строки всех постов по порядку id, без загрузки таблицы в память."""
+    posts = Post.objects.order_by('pk').values_list(
+        'text', 'pub_date', 'author__username', 'group__slug')
+    for text, pub_date, author, group in posts.iterator(chunk_size):
+        yield text, pub_date.isoformat(), author, group or ''
+
+
+class LookupCache:
+    """Кэш id по естественному ключу: один запрос на новое значение."""
+
+    def __init__(self, queryset, field):
+        self.queryset = queryset
+        self.field = field
+        self.ids = {}
+
+    def __call__(self, value):
+        if value not in self.ids:
+            self.ids[value] = self.queryset.filter(
+                **{self.field: value}).values_list('pk', flat=True).first()
+        return self.ids[value]
+
+
+class RowError(ValueError):
+    pass
+
+
+def build_post(row, author_id, group_id):
+    """Пост из строки файла; None для неизвестного автора.
+
+    Неизвестная группа заменяется на «без группы». Неверная строка
+    поднимает RowError.
+    """
+    if not isinstance(row, dict):
+        raise RowError('не JSON-объект')
+    text = row.get('text')
+    if not isinstance(text, str) or not text.strip():
+        raise RowError('нет текста поста')
+    pub_date = row.get('pub_date') or None
+    if pub_date is not None:
+        try:
+            pub_date = parse_datetime(str(pub_date))
+        except ValueError:
+            pub_date = None
+        if pub_date is None:
+            raise RowError(f'неверная дата {row["pub_date"]!r}')
+        if timezone.is_naive(pub_date):
+            pub_date = timezone.make_aware(pub_date)
+    author = author_id(row.get('author'))
+    if author is None:
+        return None
+    group = row.get('group')
+    return Post(
+        text=text,
+        pub_date=pub_date,
+        author_id=author,
+        group_id=group_id(group) if group else None,
+    )
+
+
+def import_rows(rows, batch_size=1000):
+    """Создаёт посты пачками bulk_create.
+
+    Возвращает (создано, пропущено, ошибки): пропускаются строки с
+    неизвестным автором, ошибки - список (номер записи, сообщение) для
+    неверных строк, которые тоже не загружаются. Счётчики постов
+    обновляются в транзакции каждой пачки, а страницы лент сбрасываются,
+    даже если загрузка прервалась.
+    """
+    author_id = LookupCache(User.objects, 'username')
+    group_id = LookupCache(Group.objects, 'slug')
+    created = skipped = 0
+    errors = []
+    batch = []
+    try:
+        for number, row in enumerate(rows, 1):
+            try:
+                post = build_post(row, author_id, group_id)
+            except RowError as error:
+                errors.append((number, str(error)))
+                continue
+            if post is None:
+                skipped += 1
+                continue
+            batch.append(post)
+            if len(batch) == batch_size:
+                created += _save(batch)
+                batch = []
+        created += _save(batch)
+    finally:
+        _bump_pages(author_id, group_id)
+    return created, skipped, errors
+
+
+def _save(batch):
+    """Сохраняет пачку с датами из файла.
+
+    pub_date - auto_now_add, и bulk_create ставит всем постам текущее
+    время; даты из файла записываются одним bulk_update на пачку в той
+    же транзакции.
+    """
+    if not batch:
+        return 0
+    dates = [post.pub_date for post in batch]
+    with transaction.atomic():
+        Post.objects.bulk_create(batch)
+        pks = [post.pk for post in batch]
+        if None in pks:
+            # SQLite не возвращает id из bulk_create. Запись в транзакции
+            # держит блокировку базы до коммита, поэтому последние
+            # len(batch) id принадлежат этой пачке.
+            pks = sorted(Post.objects.order_by('-pk').values_list(
+                'pk', flat=True)[:len(batch)])
+        dated = []
+        for post, pk, pub_date in zip(batch, pks, dates):
+            post.pk = pk
+            if pub_date is not None:
+                post.pub_date = pub_date
+                dated.append(post)
+        Post.objects.bulk_update(dated, ['pub_date'], batch_size=len(batch))
+        for author, count in Counter(
+                post.author_id for post in batch).items():
+            change_posts_count(author, count)
+    return len(batch)
+
+
+def _bump_pages(author_id, group_id):
+    scopes = ['index']
+    scopes += [f'author:{name}' for name, pk in author_id.ids.items() if pk]
+    scopes += [f'group:{slug}' for slug, pk in group_id.ids.items() if pk]
+    bump_scopes(scopes)
+    forget_timelines('author', [pk for pk in author_id.ids.values() if pk])
+    forget_timelines('group', [pk for pk in group_id.ids.values() if pk])
@@ -1,6 +1,8 @@
 from django.urls import path
 
-from . import views
+from . import api, feeds, views
+from .conditional import (author_changed, conditional_feed, group_changed,
+                          index_changed)
 
 
 app_name = 'posts'
@@ -12,4 +14,59 @@ urlpatterns = [
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('create/', views.post_create, name='post_create'),
+    path('search/', views.search, name='search'),
+    path(
+        'rss/',
+        conditional_feed('index', index_changed)(feeds.PostsFeed()),
+        name='index_rss'
+    ),
+    path(
+        'atom/',
+        conditional_feed('index', index_changed)(feeds.PostsAtomFeed()),
+        name='index_atom'
+    ),
+    path(
+        'group/<slug:slug>/rss/',
+        conditional_feed('group:{slug}', group_changed)(feeds.GroupFeed()),
+        name='group_rss'
+    ),
+    path(
+        'group/<slug:slug>/atom/',
+        conditional_feed(
+            'group:{slug}', group_changed)(feeds.GroupAtomFeed()),
+        name='group_atom'
+    ),
+    path(
+        'profile/<str:username>/rss/',
+        conditional_feed(
+            'author:{username}', author_changed)(feeds.AuthorFeed()),
+        name='profile_rss'
+    ),
+    path(
+        'profile/<str:username>/atom/',
+        conditional_feed(
+            'author:{username}', author_changed)(feeds.AuthorAtomFeed()),
+        name='profile_atom'
+    ),
+    path('api/posts/', api.post_list, name='api_posts'),
+    path(
+        'api/posts/<int:post_id>/',
+        api.post_detail,
+        name='api_post_detail'
+    ),
+    path(
+        'api/groups/<slug:slug>/posts/',
+        api.group_posts,
+        name='api_group_posts'
+    ),
+    path(
+        'api/profiles/<str:username>/posts/',
+        api.author_posts,
+        name='api_author_posts'
+    ),
+    path(
+        'groups/autocomplete/',
+        views.group_autocomplete,
+        name='group_autocomplete'
+    ),
 ]
@@ -1,9 +1,145 @@
+import base64
+import binascii
+from collections.abc import Sequence
+
 from django.core.paginator import Paginator
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
 
 from yatube import settings
 
 
-def paginator(request, posts_list):
+class CursorPage(Sequence):
+    """Страница ленты, выбранная по курсору (pub_date, id) без COUNT(*)."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return '<Cursor page>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_previous() or self.has_next()
+
+
+def encode_cursor(pub_date, pk):
+    raw = f'{pub_date.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Возвращает (pub_date, pk) или None для испорченного курсора."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        pub_date, pk = raw.decode().split('|')
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if pub_date is None:
+        return None
+    return pub_date, pk
+
+
+def cursor_page(posts_list, after=None, before=None,
+                per_page=settings.NUMBER_OF_POSTS_IN_PAG):
+    """Страница ленты по ключу (pub_date, id): без OFFSET и без подсчёта.
+
+    after - курсор последнего поста предыдущей страницы (листаем к старым),
+    before - курсор первого поста следующей страницы (листаем к новым).
+    """
+    position = decode_cursor(before) if before else None
+    if position is not None:
+        pub_date, pk = position
+        rows = list(
+            posts_list.filter(
+                Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk)
+            ).order_by('pub_date', 'pk')[:per_page + 1]
+        )
+        has_previous = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        has_next = True
+    else:
+        position = decode_cursor(after) if after else None
+        if position is not None:
+            pub_date, pk = position
+            posts_list = posts_list.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+            )
+        rows = list(posts_list.order_by('-pub_date', '-pk')[:per_page + 1])
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+        has_previous = position is not None
+    if not rows:
+        return CursorPage(rows)
+    return CursorPage(
+        rows,
+        next_cursor=(
+            encode_cursor(rows[-1].pub_date, rows[-1].pk)
+            if has_next else None),
+        previous_cursor=(
+            encode_cursor(rows[0].pub_date, rows[0].pk)
+            if has_previous else None),
+    )
+
+
+def page_window(page_obj, on_each_side=2, on_ends=1):
+    """Номера страниц для навигации: окно вокруг текущей и края ленты.
+
+    None обозначает пропуск (многоточие). Длина списка не зависит от
+    числа страниц.
+    """
+    number = page_obj.number
+    num_pages = page_obj.paginator.num_pages
+    if num_pages <= (on_each_side + on_ends + 1) * 2:
+        return list(range(1, num_pages + 1))
+    window = []
+    if number > on_each_side + on_ends + 1:
+        window += [*range(1, on_ends + 1), None]
+        window += range(number - on_each_side, number)
+    else:
+        window += range(1, number)
+    if number < num_pages - on_each_side - on_ends:
+        window += range(number, number + on_each_side + 1)
+        window += [None, *range(num_pages - on_ends + 1, num_pages + 1)]
+    else:
+        window += range(number, num_pages + 1)
+    return window
+
+
+def paginator(request, posts_list, count=None):
+    """Страница ленты. count - заранее известное число постов, чтобы
+    Paginator не выполнял COUNT(*).
+
+    Параметр after или before, даже пустой, включает курсорный режим:
+    пустой ?after= - первая страница без подсчёта постов.
+    """
+    after = request.GET.get('after')
+    before = request.GET.get('before')
+    cursor_mode = (
+        after is not None or before is not None
+        or settings.PAGINATION_MODE == 'cursor')
+    queryset = getattr(posts_list, 'queryset', posts_list)
+    if cursor_mode and isinstance(queryset, QuerySet):
+        return cursor_page(queryset, after, before)
     page = Paginator(posts_list, settings.NUMBER_OF_POSTS_IN_PAG)
+    if count is not None:
+        page.count = count
     page_number = request.GET.get('page')
     return page.get_page(page_number)
@@ -1,24 +1,45 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
-from .forms import PostForm
+from core.asgi import read_only
+
+from .authors import CARD_FIELDS
+from .cache import cache_anonymous_page, post_scopes
+from .conditional import (author_changed, conditional_feed, group_changed,
+                          index_changed, post_changed)
+from .forms import PostForm, SearchForm
+from .groups import attach_groups, prefix_filter, registry
 from .models import Group, Post
+from .search import SearchResults
+from .stats import author_posts_count
+from .timelines import timeline
 from .utils import paginator
 
 
+@read_only
+@conditional_feed('index', index_changed)
+@cache_anonymous_page('index')
 def index(request):
-    posts_list = Post.objects.select_related('author', 'group').all()
-    page_obj = paginator(request, posts_list)
+    posts_list = Post.objects.only(*CARD_FIELDS)
+    page_obj = attach_groups(paginator(request, posts_list))
     context = {
         'page_obj': page_obj,
     }
     return render(request, 'posts/index.html', context)
 
 
+@read_only
+@conditional_feed('group:{slug}', group_changed)
+@cache_anonymous_page('group:{slug}')
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
-    posts_list = group.posts.select_related('author').all()
+    group = registry.get_by_slug(slug)
+    if group is None:
+        raise Http404('Группа не найдена.')
+    posts_list = timeline(
+        'group', group.pk, group.posts.only(*CARD_FIELDS))
     page_obj = paginator(request, posts_list)
     context = {
         'page_obj': page_obj,
@@ -27,11 +48,16 @@ def group_posts(request, slug):
     return render(request, 'posts/group_list.html', context)
 
 
+@read_only
+@conditional_feed('author:{username}', author_changed)
+@cache_anonymous_page('author:{username}')
 def profile(request, username):
-    author = get_object_or_404(get_user_model(), username=username)
-    posts_list = author.posts.select_related('group').all()
-    count = posts_list.count()
-    page_obj = paginator(request, posts_list)
+    author = get_object_or_404(
+        get_user_model().objects.select_related('stats'), username=username)
+    posts_list = timeline(
+        'author', author.pk, author.posts.only(*CARD_FIELDS))
+    count = author_posts_count(author)
+    page_obj = attach_groups(paginator(request, posts_list, count))
     context = {
         'author': author,
         'page_obj': page_obj,
@@ -40,14 +66,53 @@ def profile(request, username):
     return render(request, 'posts/profile.html', context)
 
 
+@read_only
+@conditional_feed(post_scopes, post_changed)
+@cache_anonymous_page(post_scopes)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    post = get_object_or_404(
+        Post.objects.select_related('author__stats', 'group'), pk=post_id)
     context = {
         'post': post,
+        'posts_count': author_posts_count(post.author),
     }
     return render(request, 'posts/post_detail.html', context)
 
 
+def search(request):
+    form = SearchForm(request.GET or None)
+    context = {
+        'form': form,
+    }
+    if form.is_valid():
+        query = request.GET.copy()
+        query.pop('page', None)
+        context['page_obj'] = paginator(request, SearchResults(
+            form.cleaned_data['q'],
+            group=form.cleaned_data['group'],
+            author=form.cleaned_data['author'],
+        ))
+        context['page_query'] = query.urlencode() + '&'
+    return render(request, 'posts/search.html', context)
+
+
+def group_autocomplete(request):
+    """Группы, название или слаг которых начинаются с ?q=.
+
+    Префикс ищется диапазоном по индексам title и slug, ответ ограничен
+    GROUP_AUTOCOMPLETE_LIMIT записями.
+    """
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({'results': []})
+    groups = Group.objects.filter(prefix_filter(query)).order_by(
+        'title').values_list('pk', 'title', 'slug')
+    return JsonResponse({'results': [
+        {'id': pk, 'text': title, 'slug': slug}
+        for pk, title, slug in groups[:settings.GROUP_AUTOCOMPLETE_LIMIT]
+    ]})
+
+
 @login_required
 def post_create(request):
     form = PostForm(request.POST or None)
@@ -61,7 +126,8 @@ def post_create(request):
 
 @login_required
 def post_edit(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    post = get_object_or_404(
+        Post.objects.select_related('author', 'group'), pk=post_id)
     if request.user != post.author:
         return redirect('posts:post_detail', post_id=post_id)
     form = PostForm(
@@ -0,0 +1,29 @@
+// Поиск группы для select с data-autocomplete-url (posts/forms.py).
+document.querySelectorAll('select[data-autocomplete-url]').forEach(function (select) {
+  var search = document.createElement('input');
+  var timer = null;
+  search.type = 'search';
+  search.className = 'form-control mb-2';
+  search.placeholder = 'Найти группу по названию или слагу';
+  select.parentNode.insertBefore(search, select);
+  search.addEventListener('input', function () {
+    clearTimeout(timer);
+    timer = setTimeout(function () {
+      var url = select.dataset.autocompleteUrl + '?q=' + encodeURIComponent(search.value);
+      fetch(url).then(function (response) {
+        return response.json();
+      }).then(function (data) {
+        Array.from(select.options).forEach(function (option) {
+          if (option.value && !option.selected) {
+            option.remove();
+          }
+        });
+        data.results.forEach(function (group) {
+          if (!select.querySelector('option[value="' + group.id + '"]')) {
+            select.add(new Option(group.text, group.id));
+          }
+        });
+      });
+    }, 200);
+  });
+});
@@ -0,0 +1,17 @@
+"""
+ASGI config for yatube project.
+
+It exposes the ASGI callable as a module-level variable named
+``application``. Requests are served by the WSGI handler in bounded
+thread pools, see core/asgi.py.
+"""
+
+import os
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+
+from core.asgi import get_asgi_application  # noqa: E402
+from core.warmup import warm_up_on_start  # noqa: E402
+
+application = get_asgi_application()
+warm_up_on_start()
@@ -7,6 +7,10 @@ SECRET_KEY = '%^zona&w=abolg_uo+(nzj$f3baa)c^t7ag&8zjfmalrdpk@5m'
 
 DEBUG = True
 
+INTERNAL_IPS = [
+    '127.0.0.1',
+]
+
 ALLOWED_HOSTS = [
     'localhost',
     '127.0.0.1',
@@ -28,13 +32,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.StaticFilesMiddleware',
+    'core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'yatube.urls'
@@ -58,12 +65,44 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'yatube.wsgi.application'
+# yatube/wsgi.py и yatube/asgi.py прогревают процесс при старте
+# (core/warmup.py): импорт view, таблицы URL, разбор шаблонов.
+WARMUP_ON_START = not DEBUG
 
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'CONN_MAX_AGE': 60,
+    }
+}
+
+# Реплики только для чтения: ленты и страницы постов читаются с них
+# (core/routers.py). Локально YATUBE_SQLITE_REPLICAS=2 заводит две копии
+# SQLite, их обновляет manage.py sync_replicas. Тесты запускаются без
+# реплик.
+SQLITE_REPLICAS = int(os.environ.get('YATUBE_SQLITE_REPLICAS', 0))
+for number in range(1, SQLITE_REPLICAS + 1):
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        'NAME': os.path.join(BASE_DIR, f'db.replica{number}.sqlite3'),
+        'TEST': {'MIRROR': 'default'},
     }
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+# Сколько секунд после записи клиент читает с основной базы.
+REPLICA_PIN_SECONDS = 10
+REPLICA_PIN_COOKIE = 'primary_pin'
+
+# PRAGMA для каждого нового соединения SQLite (core/sqlite.py), по
+# порядку: busy_timeout первым, чтобы смена журнала ждала блокировку.
+# cache_size в минус-килобайтах, mmap_size в байтах.
+SQLITE_PRAGMAS = {
+    'busy_timeout': 5000,
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'cache_size': -64000,
+    'mmap_size': 256 * 1024 * 1024,
 }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -102,13 +141,114 @@ USE_TZ = True
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
 
 STATIC_URL = '/static/'
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+
+# Без DEBUG collectstatic добавляет в имена файлов хеш содержимого и пишет
+# рядом их .gz и .br копии (brotli - необязательный пакет). Их отдаёт
+# core.middleware.StaticFilesMiddleware: файлы с хешем кэшируются
+# браузером на STATIC_IMMUTABLE_MAX_AGE секунд без перепроверки,
+# остальные - на STATIC_MAX_AGE.
+if not DEBUG:
+    STATICFILES_STORAGE = (
+        'core.staticfiles.CompressedManifestStaticFilesStorage')
+STATIC_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+STATIC_MAX_AGE = 60 * 60
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 # LOGOUT_REDIRECT_URL = 'posts:index'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Письма уходят через очередь задач бэкендом TASKS_EMAIL_BACKEND: без
+# DEBUG - воркером run_tasks вне запроса, при DEBUG (TASKS_EAGER) - сразу.
+EMAIL_BACKEND = 'core.mail.QueuedEmailBackend'
+TASKS_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 
 NUMBER_OF_POSTS_IN_PAG = 10
+# 'pages' - номера страниц (?page=), 'cursor' - курсоры (?after=/?before=)
+# без COUNT(*) и OFFSET. Курсор в запросе включает курсорный режим всегда.
+PAGINATION_MODE = 'pages'
+
+# Кэш отрисованных карточек постов. Подойдёт любой бэкенд из CACHES:
+# LocMemCache, FileBasedCache или DatabaseCache (SQLite).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+POST_CARD_CACHE = 'default'
+POST_CARD_CACHE_TIMEOUT = 60 * 60
+
+# Кэш страниц лент для анонимных посетителей (выключен по умолчанию).
+# Свежая копия живёт PAGE_CACHE_TIMEOUT секунд, устаревшая хранится до
+# PAGE_CACHE_STALE_TIMEOUT и отдаётся, пока один процесс её пересобирает.
+PAGE_CACHE = False
+PAGE_CACHE_ALIAS = 'default'
+PAGE_CACHE_TIMEOUT = 60
+PAGE_CACHE_STALE_TIMEOUT = 60 * 60
+PAGE_CACHE_LOCK_TIMEOUT = 30
+
+# Доля запросов, для которых RequestMetricsMiddleware собирает метрики.
+METRICS_SAMPLE_RATE = 0.1
+# Кроме персонала /metrics/ доступны по заголовку
+# Authorization: Bearer METRICS_TOKEN и адресам METRICS_ALLOWED_IPS.
+METRICS_TOKEN = os.environ.get('YATUBE_METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = []
+
+# Сколько групп возвращает автодополнение в форме поста.
+GROUP_AUTOCOMPLETE_LIMIT = 20
+
+# Материализованные ленты групп и авторов (выключены по умолчанию):
+# id последних TIMELINE_SIZE постов хранятся в кэше TIMELINE_CACHE
+# TIMELINE_TIMEOUT секунд.
+TIMELINES = False
+TIMELINE_CACHE = 'default'
+TIMELINE_SIZE = 1000
+TIMELINE_TIMEOUT = 60 * 60
+
+# Реестр групп: копия в памяти процесса (LRU на GROUP_REGISTRY_SIZE
+# записей, GROUP_REGISTRY_TTL секунд) и в кэше GROUP_CACHE.
+GROUP_CACHE = 'default'
+GROUP_CACHE_TIMEOUT = 5 * 60
+GROUP_REGISTRY_SIZE = 1000
+GROUP_REGISTRY_TTL = 30
+
+# Число постов в RSS и Atom лентах.
+FEED_ITEMS = 20
+
+# JSON API: размер страницы по умолчанию и наибольший для ?limit=,
+# число строк, читаемых из базы за раз при потоковой выдаче.
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 1000
+API_CHUNK_SIZE = 200
+
+# ASGI (yatube/asgi.py): потоки для view только для чтения и для
+# остальных запросов.
+ASGI_READ_THREADS = 16
+ASGI_WRITE_THREADS = 4
+
+# Сессии и пользователь сессии (core/auth.py) могут читаться из кэша,
+# но только из общего для всех процессов бэкенда: с кэшем в памяти
+# процесса выход и смена пароля не дойдут до остальных (проверка
+# core.W001). С общим кэшем 'shared':
+#   SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+#   SESSION_CACHE_ALIAS = 'shared'
+#   USER_CACHE = 'shared'
+# Без серверного хранения: 'django.contrib.sessions.backends.signed_cookies'.
+USER_CACHE = None
+USER_CACHE_TIMEOUT = 5 * 60
+
+# Фоновые задачи (core/tasks.py). При TASKS_EAGER задачи выполняются сразу
+# в запросе (удобно при разработке), иначе ждут в таблице core_task
+# воркера manage.py run_tasks - без него, например, письма не уйдут.
+# Упавшая задача повторяется через TASKS_RETRY_DELAY * 2**(попытка - 1)
+# секунд, после TASKS_MAX_ATTEMPTS попыток остаётся в таблице с ошибкой.
+# Взятая воркером задача снова станет доступна через TASKS_LEASE секунд,
+# если он не успел её выполнить.
+TASKS_EAGER = DEBUG
+TASKS_BATCH_SIZE = 20
+TASKS_MAX_ATTEMPTS = 5
+TASKS_RETRY_DELAY = 10
+TASKS_LEASE = 5 * 60
+TASKS_POLL_INTERVAL = 1